@@ -0,0 +1,39 @@
+"""Asyncio entry point, used when SLACK_ASYNC_MODE is enabled."""
+
+import asyncio
+import logging
+import sys
+from src.async_slack_handler import AsyncSlackHandler
+from src.config.settings import Config
+from src.config.telemetry import start_metrics_server
+
+# Simple logging setup
+logging.basicConfig(
+    level=getattr(logging, Config.LOG_LEVEL),
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+logger = logging.getLogger(__name__)
+
+async def run():
+    """Start the K8s troubleshooting agent on an asyncio event loop."""
+    handler = AsyncSlackHandler()
+    logger.info("Starting K8s Troubleshooting Agent (async)...")
+    await handler.start()
+
+def main():
+    """Start the async K8s troubleshooting agent."""
+    try:
+        Config.validate()
+        start_metrics_server()
+        asyncio.run(run())
+    except ValueError as e:
+        logger.error(f"Config error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Startup error: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
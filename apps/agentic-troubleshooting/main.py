@@ -4,6 +4,7 @@ import logging
 import sys
 from src.slack_handler import SlackHandler
 from src.config.settings import Config
+from src.config.telemetry import start_metrics_server
 
 # Simple logging setup
 logging.basicConfig(
@@ -16,8 +17,14 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Start the K8s troubleshooting agent."""
+    if Config.SLACK_ASYNC_MODE:
+        import async_main
+        async_main.main()
+        return
+    
     try:
         Config.validate()
+        start_metrics_server()
         handler = SlackHandler()
         logger.info("Starting K8s Troubleshooting Agent...")
         handler.start()
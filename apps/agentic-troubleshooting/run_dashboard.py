@@ -26,10 +26,15 @@ def main():
         "--server.address", "0.0.0.0"
     ]
     
+    # Let the dashboard import shared modules from src/
+    env = os.environ.copy()
+    app_root = str(Path(__file__).parent)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [app_root, env.get('PYTHONPATH')]))
+    
     print(f"Starting dashboard at http://localhost:8501")
     print(f"Command: {' '.join(cmd)}")
     
-    subprocess.run(cmd)
+    subprocess.run(cmd, env=env)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
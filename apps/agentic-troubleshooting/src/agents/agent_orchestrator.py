@@ -1,48 +1,266 @@
 from strands import Agent, tool
+from src.agents.classifier import LocalClassifier
 from src.agents.k8s_specialist import K8sSpecialist
+from src.agents.model_router import ModelRouter, RoutingDecision
+from src.agents.memory_client import MemoryAgentClient, MemorySkillUnavailable, format_solutions
+from src.agents.response_cache import CacheLookup, SemanticResponseCache, titan_embedding
+from src.agents.session_manager import ConversationSession, SessionManager
+from src.config.aws_clients import get_bedrock_model, get_client
 from src.config.settings import Config
-from src.config.telemetry import setup_langfuse_telemetry
+from src.config.telemetry import (
+    ToolTimingHook, record_cache, record_usage, setup_langfuse_telemetry, setup_otlp_telemetry, stage
+)
 from src.prompts import ORCHESTRATOR_SYSTEM_PROMPT, CLASSIFICATION_PROMPT, K8S_KEYWORDS
-from strands_tools.a2a_client import A2AClientToolProvider
+from src.utils.text import normalize_message
+from src.utils.ttl_cache import TTLCache
+from strands.agent.conversation_manager import SlidingWindowConversationManager
 from strands.hooks.events import BeforeInvocationEvent
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextvars
+from typing import Optional, Tuple
 import json
-import boto3
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 # Initialize telemetry if enabled
 setup_langfuse_telemetry()
+setup_otlp_telemetry()
 
 class AgentSilentException(Exception):
     """Exception that should not generate error responses."""
-    pass
+    # Off-topic messages end here on purpose; stage() records this instead of "error"
+    metrics_outcome = "silent"
 
 class OrchestratorAgent:
     """Direct K8s troubleshooting orchestrator."""
     
     def __init__(self):
-        self.k8s_specialist = K8sSpecialist()
-        self.last_user_message = None
+        self.router = ModelRouter(
+            fast_model_id=Config.FAST_MODEL_ID,
+            large_model_id=Config.BEDROCK_MODEL_ID,
+            enabled=Config.ENABLE_MODEL_ROUTING,
+            max_simple_words=Config.MODEL_ROUTING_MAX_SIMPLE_WORDS
+        )
+        self.k8s_specialist = K8sSpecialist(self.router)
+        self.sessions = SessionManager(self._create_session)
+        self.memory_client = MemoryAgentClient(
+            base_url=Config.MEMORY_AGENT_SERVER_URL,
+            timeout=Config.MEMORY_AGENT_TIMEOUT_SECONDS,
+            max_connections=Config.MEMORY_AGENT_MAX_CONNECTIONS
+        )
+        self.classification_cache = TTLCache(
+            max_size=Config.CLASSIFICATION_CACHE_SIZE,
+            ttl_seconds=Config.CLASSIFICATION_CACHE_TTL_SECONDS
+        )
+        self.local_classifier = None
+        if Config.ENABLE_LOCAL_CLASSIFIER:
+            self.local_classifier = LocalClassifier(Config.LOCAL_CLASSIFIER_CONFIDENCE)
+        
+        self.response_cache = None
+        if Config.ENABLE_RESPONSE_CACHE:
+            self.response_cache = SemanticResponseCache(
+                embed=titan_embedding,
+                similarity_threshold=Config.RESPONSE_CACHE_SIMILARITY,
+                ttl_seconds=Config.RESPONSE_CACHE_TTL_SECONDS,
+                max_entries=Config.RESPONSE_CACHE_SIZE
+            )
+        
+        # Speculative memory searches and cache lookups run alongside classification
+        self.prefetch_executor = ThreadPoolExecutor(
+            max_workers=Config.WORKER_POOL_SIZE,
+            thread_name_prefix="memory-prefetch"
+        )
         
         try:
-            self.bedrock_client = boto3.client('bedrock-runtime', region_name=Config.AWS_REGION)
+            self.bedrock_client = get_client('bedrock-runtime')
         except Exception as e:
             logger.warning(f"Failed to initialize Bedrock client, falling back to keywords: {e}")
             self.bedrock_client = None
-            
-        self.agent = Agent(
+    
+    def _create_session(self, key: str) -> ConversationSession:
+        """Create the orchestrator and specialist agents for one Slack thread."""
+        specialist_agent = self.k8s_specialist.create_agent()
+        
+        @tool
+        def troubleshoot_k8s(query: str) -> str:
+            """Perform K8s troubleshooting."""
+            try:
+                return self.k8s_specialist.troubleshoot(query, agent=specialist_agent)
+            except Exception as e:
+                return f"Troubleshooting error: {e}"
+        
+        agent = Agent(
             name="K8s Orchestrator",
             system_prompt=ORCHESTRATOR_SYSTEM_PROMPT,
-            model=Config.BEDROCK_MODEL_ID,
-            tools=[self.troubleshoot_k8s, self.memory_agent_provider]
+            model=get_bedrock_model(Config.BEDROCK_MODEL_ID),
+            tools=[troubleshoot_k8s, self.search_memory, self.save_to_memory],
+            conversation_manager=SlidingWindowConversationManager(
+                window_size=Config.SESSION_HISTORY_MESSAGES
+            ),
+            hooks=[ToolTimingHook("orchestrator")]
         )
         
-        self.agent.hooks.add_callback(BeforeInvocationEvent, self.callback_message_validator)
+        agent.hooks.add_callback(BeforeInvocationEvent, self.callback_message_validator)
+        return ConversationSession(key, agent, specialist_agent)
+    
+    def invoke(self, message: str, thread_id: str, context: str = None):
+        """Run the orchestrator for one user message within its thread's session."""
+        agent = self.sessions.get(thread_id).orchestrator_agent
+        prompt, lookup = self._prepare(agent, message, context)
+        if lookup and lookup.response:
+            return self._answer_from_cache(agent, message, lookup)
+        
+        decision = RoutingDecision(*agent.state.get("route"))
+        start = time.perf_counter()
+        with stage("orchestrator_agent", **{"model.tier": decision.tier}):
+            result = agent(prompt)
+            record_usage("orchestrator", agent, result)
+        self.router.record("orchestrator", decision, time.perf_counter() - start)
+        self._cache_response(lookup, result)
+        return result
+    
+    def stream(self, message: str, thread_id: str, context: str = None):
+        """Stream orchestrator events for one user message within its thread's session."""
+        agent = self.sessions.get(thread_id).orchestrator_agent
+        prompt, lookup = self._prepare(agent, message, context)
+        if lookup and lookup.response:
+            return self._replay(self._answer_from_cache(agent, message, lookup))
+        return self._stream_and_cache(agent, prompt, lookup)
+    
+    async def _replay(self, response: str):
+        yield {"result": response}
+    
+    async def _stream_and_cache(self, agent: Agent, prompt: str, lookup: Optional[CacheLookup]):
+        decision = RoutingDecision(*agent.state.get("route"))
+        start = time.perf_counter()
+        async for event in agent.stream_async(prompt):
+            if "result" in event:
+                self.router.record("orchestrator", decision, time.perf_counter() - start)
+                record_usage("orchestrator", agent, event["result"])
+                self._cache_response(lookup, event["result"])
+            yield event
+    
+    def _prepare(self, agent: Agent, message: str, context: str = None) -> Tuple[str, Optional[CacheLookup]]:
+        """Classify the message and build the agent prompt.
+        
+        Memory is searched speculatively while the message is classified, so a
+        hit is already in the prompt when the agent starts. A new question is
+        also looked up in the response cache at the same time. If the message
+        is not worth answering the speculative work is abandoned.
+        """
+        agent.state.set("last_user_message", message)
+        
+        prefetch = None
+        if Config.ENABLE_MEMORY_PREFETCH:
+            prefetch = self._submit(self.memory_client.retrieve, message)
+        
+        # Only fresh questions are cached; follow-ups depend on their thread
+        cache_lookup = None
+        if self.response_cache and not context and not agent.messages:
+            cache_lookup = self._submit(self.response_cache.lookup, message)
+        
+        classification = self._classify(message)
+        agent.state.set("classification", classification)
+        if not classification:
+            for future in (prefetch, cache_lookup):
+                if future:
+                    future.cancel()
+            logger.info(f"Message classification: {classification}")
+            raise AgentSilentException("Agent decided not to respond to this message")
+        
+        lookup = self._cached_response(cache_lookup)
+        if lookup and lookup.response:
+            if prefetch:
+                prefetch.cancel()
+            return None, lookup
+        
+        solutions = self._prefetched_memory(prefetch)
+        memory_hit = any(
+            solution.get("distance", 1.0) <= Config.MODEL_ROUTING_MEMORY_MAX_DISTANCE
+            for solution in solutions or []
+        )
+        decision = self.router.route_orchestrator(message, context, memory_hit)
+        agent.model = get_bedrock_model(decision.model_id)
+        agent.state.set("route", list(decision))
+        
+        memory = format_solutions(solutions) if solutions is not None else None
+        # Once the thread has a session its earlier turns are already in agent.messages;
+        # resending the thread every turn would store it again in each user message
+        if agent.messages:
+            context = None
+        return self._build_prompt(message, context, memory), lookup
+    
+    def _submit(self, fn, *args) -> Future:
+        """Run speculative work on the prefetch pool inside the caller's trace context."""
+        return self.prefetch_executor.submit(contextvars.copy_context().run, fn, *args)
+    
+    def _cached_response(self, cache_lookup: Optional[Future]) -> Optional[CacheLookup]:
+        """Wait for the response cache lookup, giving up after the cache timeout."""
+        if cache_lookup is None:
+            return None
+        try:
+            with stage("response_cache"):
+                lookup = cache_lookup.result(timeout=Config.RESPONSE_CACHE_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Response cache lookup unavailable: {e!r}")
+            return None
+        
+        record_cache("response", bool(lookup.response))
+        outcome = "hit" if lookup.response else "miss"
+        logger.info(f"Response cache {outcome} (similarity {lookup.similarity:.3f}): {self.response_cache.stats()}")
+        return lookup
+    
+    def _answer_from_cache(self, agent: Agent, message: str, lookup: CacheLookup) -> str:
+        """Record a cached answer in the session so follow-ups in the thread keep their context."""
+        agent.messages.extend([
+            {"role": "user", "content": [{"text": message}]},
+            {"role": "assistant", "content": [{"text": lookup.response}]}
+        ])
+        return lookup.response
+    
+    def _cache_response(self, lookup: Optional[CacheLookup], result):
+        """Cache a completed answer; silent and failed runs raise before reaching here."""
+        if lookup is None or getattr(result, "stop_reason", "end_turn") != "end_turn":
+            return
+        self.response_cache.store(lookup, str(result).strip())
+    
+    def _prefetched_memory(self, prefetch: Optional[Future]) -> Optional[list]:
+        """Wait for the speculative memory search, giving up after the prefetch timeout."""
+        if prefetch is None:
+            return None
+        try:
+            with stage("memory_prefetch"):
+                solutions = prefetch.result(timeout=Config.MEMORY_PREFETCH_TIMEOUT_SECONDS)
+            logger.info(f"Memory prefetch returned {len(solutions)} solutions")
+            return solutions
+        except Exception as e:
+            # The agent can still call search_memory itself
+            logger.warning(f"Memory prefetch unavailable: {e!r}")
+            return None
+    
+    def _build_prompt(self, message: str, context: str = None, memory: str = None) -> str:
+        """Prepend thread history and prefetched memory so the agent sees the whole picture."""
+        if not context and not memory:
+            return message
+        
+        sections = []
+        if context:
+            sections.append(f"Earlier messages in this Slack thread:\n{context}")
+        if memory:
+            sections.append(
+                "Memory search results for the current message (already retrieved, "
+                f"do not call search_memory again for it):\n{memory}"
+            )
+        sections.append(f"Current message:\n{message}")
+        return "\n\n".join(sections)
     
     def callback_message_validator(self, event: BeforeInvocationEvent):
         """Validate message before agent invocation."""
-        classification = self._classify_with_nova(self.last_user_message)
+        classification = event.agent.state.get("classification")
+        if classification is None:
+            classification = self._classify(event.agent.state.get("last_user_message"))
         logger.info(f"Message classification: {classification}")
         
         if not classification:
@@ -50,83 +268,116 @@ class OrchestratorAgent:
 
         return classification
 
-    def _classify_with_nova(self, message: str) -> bool:
-        """Use Amazon Nova Micro to classify if message is K8s/troubleshooting related."""
-        try:
-            prompt = CLASSIFICATION_PROMPT.format(message=message)
-            
-            body = {
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [{"text": prompt}]
-                    }
-                ],
-                "inferenceConfig": {
-                    "maxTokens": 10,
-                    "temperature": 0.1
-                }
-            }
+    def _classify(self, message: str) -> bool:
+        """Classify a message, reusing recent results for equivalent messages."""
+        with stage("classification") as span:
+            key = normalize_message(message)
+            cached = self.classification_cache.get(key)
+            record_cache("classification", cached is not None)
+            if cached is not None:
+                logger.info(f"Classification cache hit: {self.classification_cache.stats()}")
+                span.set_attribute("classification.source", "cache")
+                return cached
+            logger.debug(f"Classification cache miss: {self.classification_cache.stats()}")
             
-            response = self.bedrock_client.invoke_model(
-                modelId="amazon.nova-micro-v1:0",
-                body=json.dumps(body)
-            )
-            
-            result = json.loads(response['body'].read())
-            logger.info(f"Message classification should respond:{result}")
-            
-            answer = result['output']['message']['content'][0]['text'].strip().upper()
+            # Obvious cases are decided locally without a Bedrock round-trip
+            if self.local_classifier:
+                classification = self.local_classifier.classify(message)
+                if classification is not None:
+                    logger.info(f"Local classification: {classification} ({self.local_classifier.stats()})")
+                    span.set_attribute("classification.source", "local")
+                    self.classification_cache.set(key, classification)
+                    return classification
             
-            return answer == "YES"
+            try:
+                classification = self._classify_with_nova(message)
+            except Exception as e:
+                logger.error(f"Nova classification failed: {e}")
+                # Fallback to keyword matching, not cached so Nova is retried next time
+                span.set_attribute("classification.source", "keywords")
+                return any(keyword in message.lower() for keyword in K8S_KEYWORDS)
             
-        except Exception as e:
-            logger.error(f"Nova classification failed: {e}")
-            # Fallback to keyword matching
-            return any(keyword in message.lower() for keyword in K8S_KEYWORDS)
+            span.set_attribute("classification.source", "nova")
+            self.classification_cache.set(key, classification)
+            return classification
+
+    def _classify_with_nova(self, message: str) -> bool:
+        """Use Amazon Nova Micro to classify if message is K8s/troubleshooting related.
+        
+        Raises on Bedrock errors so the caller can fall back to keywords.
+        """
+        prompt = CLASSIFICATION_PROMPT.format(message=message)
+        
+        body = {
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [{"text": prompt}]
+                }
+            ],
+            "inferenceConfig": {
+                "maxTokens": 10,
+                "temperature": 0.1
+            }
+        }
+        
+        response = self.bedrock_client.invoke_model(
+            modelId="amazon.nova-micro-v1:0",
+            body=json.dumps(body)
+        )
+        
+        result = json.loads(response['body'].read())
+        logger.info(f"Message classification should respond:{result}")
+        
+        answer = result['output']['message']['content'][0]['text'].strip().upper()
+        
+        return answer == "YES"
         
     @tool
-    def troubleshoot_k8s(self, query: str) -> str:
-        """Perform K8s troubleshooting."""
+    def search_memory(self, problem_query: str) -> str:
+        """Search stored troubleshooting solutions for problems similar to this one.
+        
+        Args:
+            problem_query (str): Description of the problem to look up
+            
+        Returns:
+            str: Matching solutions, or a message that none were found
+        """
         try:
-            return self.k8s_specialist.troubleshoot(query)
+            with stage("memory_retrieve"):
+                solutions = self.memory_client.retrieve(problem_query)
+            logger.info(f"Memory search returned {len(solutions)} solutions for: {problem_query[:100]}...")
+            return format_solutions(solutions)
+        except MemorySkillUnavailable:
+            # Older memory servers only speak A2A
+            return self.memory_client.send_message(f"Retrieve solutions for this problem: {problem_query}")
         except Exception as e:
-            return f"Troubleshooting error: {e}"
+            logger.error(f"Memory search failed: {e}")
+            return f"Memory search failed: {e}"
     
     @tool
-    def memory_agent_provider(self, request: str) -> str:
-        """Handle Memory agent connection using a2aclienttoolprovider
+    def save_to_memory(self, problem_description: str, solution_steps: str, k8s_resources: str = "") -> str:
+        """Save a troubleshooting solution so similar problems can be answered from memory.
         
         Args:
-            request (str): The request to send to the memory agent
+            problem_description (str): The problem that was solved
+            solution_steps (str): The steps that solved it
+            k8s_resources (str): Kubernetes resources involved
             
         Returns:
-            str: Response from the memory agent
-            
-        Raises:
-            Exception: If memory agent connection fails
+            str: Confirmation or error message
         """
         try:
-            # Initialize provider with memory agent URL
-            provider = A2AClientToolProvider(known_agent_urls=[Config.MEMORY_AGENT_SERVER_URL])
-            logger.debug(f"Initialized memory agent provider: {provider}")
-            
-            # Get available tools from provider
-            tools = provider.tools
-            logger.debug(f"Available memory agent tools: {tools}")        
-            
-            # Create agent with tools and system prompt
-            agent = Agent(
-                tools=tools,
-                system_prompt="You are a memory agent interface. Discover agents and tools you can use"
+            with stage("memory_store"):
+                self.memory_client.store(problem_description, solution_steps, k8s_resources)
+            logger.info(f"Saved solution to memory for: {problem_description[:100]}...")
+            return "Solution stored successfully"
+        except MemorySkillUnavailable:
+            # Older memory servers only speak A2A
+            return self.memory_client.send_message(
+                f"Store this solution.\nProblem: {problem_description}\n"
+                f"Solution: {solution_steps}\nResources: {k8s_resources}"
             )
-            
-            # Send request and get response
-            response = agent(request)
-            logger.info(f"Memory agent response received for request: {request[:100]}...")
-            
-            return str(response)
-            
         except Exception as e:
-            logger.error(f"Memory agent operation failed: {e}")
-            raise Exception(f"Failed to process memory agent request: {str(e)}")
\ No newline at end of file
+            logger.error(f"Memory save failed: {e}")
+            return f"Failed to store solution: {e}"
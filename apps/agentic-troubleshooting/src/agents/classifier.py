@@ -0,0 +1,143 @@
+"""Local first-tier message classifier that runs ahead of Nova Micro."""
+
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+from src.prompts import CLASSIFIER_TRAINING_EXAMPLES, K8S_KEYWORDS
+from src.utils.text import fold_message
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9'_-]*")
+
+# Strong signals: when one of these matches, the message is clearly technical
+_SIGNAL_PATTERNS = [
+    # Deployment/ReplicaSet pod names, e.g. checkout-7d9f8b6c5-x2x9k; the generated
+    # hash and suffix must contain a digit, which plain hyphenated words never do
+    re.compile(r"\b[a-z0-9]+(?:-[a-z0-9]+)*-(?=[a-z0-9-]{0,16}\d)[a-z0-9]{6,10}-[a-z0-9]{5}\b"),
+    # kubectl table output
+    re.compile(r"\bNAME\s+(?:READY|STATUS|TYPE|CLUSTER-IP)\b"),
+    re.compile(r"\b\d+/\d+\s+(?:Running|Pending|CrashLoopBackOff|Error|Completed|ImagePullBackOff|Terminating)\b"),
+    # Stack traces and crash output
+    re.compile(r"Traceback \(most recent call last\)"),
+    re.compile(r"^\s+at [\w.$]+\(.*\)\s*$", re.MULTILINE),
+    re.compile(r"\bpanic: |\bgoroutine \d+ \["),
+    re.compile(r"\b\w+(?:Error|Exception)\b:"),
+    re.compile(r"\bexit code \d+\b", re.IGNORECASE),
+]
+
+# Keywords that only come up when talking about Kubernetes; generic ones such as
+# status, service, restart, logs or node also appear in chit-chat
+_SPECIFIC_KEYWORDS = re.compile(
+    r"\b(?:pods?|crashloopbackoff|kubernetes|k8s|kubectl|namespaces?|deployments?)\b", re.IGNORECASE
+)
+
+
+class LexicalModel:
+    """Multinomial naive Bayes over lowercase word tokens."""
+    
+    def __init__(self, log_priors: Tuple[float, float], log_likelihoods: dict, default_log_likelihoods: Tuple[float, float]):
+        self.log_priors = log_priors
+        self.log_likelihoods = log_likelihoods
+        self.default_log_likelihoods = default_log_likelihoods
+    
+    @classmethod
+    def train(cls, examples: Iterable[Tuple[str, bool]], alpha: float = 1.0) -> "LexicalModel":
+        """Fit token likelihoods from (text, label) examples with Laplace smoothing."""
+        counts = (Counter(), Counter())
+        docs = [0, 0]
+        for text, label in examples:
+            counts[int(label)].update(tokenize(text))
+            docs[int(label)] += 1
+        
+        vocabulary = set(counts[0]) | set(counts[1])
+        totals = [sum(c.values()) + alpha * len(vocabulary) for c in counts]
+        log_likelihoods = {
+            token: tuple(math.log((counts[i][token] + alpha) / totals[i]) for i in (0, 1))
+            for token in vocabulary
+        }
+        defaults = tuple(math.log(alpha / totals[i]) for i in (0, 1))
+        priors = tuple(math.log(docs[i] / sum(docs)) for i in (0, 1))
+        return cls(priors, log_likelihoods, defaults)
+    
+    def predict(self, tokens: list) -> float:
+        """Probability that the tokens belong to a message worth responding to."""
+        scores = list(self.log_priors)
+        for token in tokens:
+            # Unknown tokens carry no evidence either way
+            if token in self.log_likelihoods:
+                no, yes = self.log_likelihoods[token]
+                scores[0] += no
+                scores[1] += yes
+        margin = max(min(scores[1] - scores[0], 50), -50)
+        return 1 / (1 + math.exp(-margin))
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN.findall((text or "").lower())
+
+
+def has_technical_signal(message: str) -> bool:
+    """Whether the message contains pasted pod names, kubectl output or crash output."""
+    return any(pattern.search(message or "") for pattern in _SIGNAL_PATTERNS)
+
+
+class LocalClassifier:
+    """Decides obvious YES/NO cases in microseconds, leaving the rest to Bedrock.
+    
+    A message is a confident YES when it matches a strong technical signal
+    (pod names, kubectl output, stack traces), or when it has a Kubernetes-
+    specific keyword or at least two K8S_KEYWORDS matches and the lexical
+    model agrees. It is a confident NO only when no keyword matches and the
+    message is a known chit-chat example or the model is as sure the other
+    way. Everything in between, including a single generic keyword, returns
+    None.
+    """
+    
+    def __init__(self, confidence_threshold: float):
+        self.confidence_threshold = confidence_threshold
+        self.keyword_pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(keyword) for keyword in K8S_KEYWORDS) + r")",
+            re.IGNORECASE
+        )
+        self.model = LexicalModel.train(CLASSIFIER_TRAINING_EXAMPLES)
+        self.known_chatter = {fold_message(text) for text, label in CLASSIFIER_TRAINING_EXAMPLES if not label}
+        self._lock = threading.Lock()
+        self.decided = 0
+        self.deferred = 0
+    
+    def classify(self, message: str) -> Optional[bool]:
+        """Return True/False for confident decisions, or None if Bedrock should decide."""
+        decision = self._decide(message or "")
+        with self._lock:
+            if decision is None:
+                self.deferred += 1
+            else:
+                self.decided += 1
+        return decision
+    
+    def _decide(self, message: str) -> Optional[bool]:
+        if has_technical_signal(message):
+            return True
+        
+        keyword_hits = len(self.keyword_pattern.findall(message))
+        probability = self.model.predict(tokenize(message))
+        
+        if _SPECIFIC_KEYWORDS.search(message) or keyword_hits >= 2:
+            # Each keyword hit is strong evidence on its own
+            probability = 1 - (1 - probability) / (4 ** keyword_hits)
+            return True if probability >= self.confidence_threshold else None
+        if keyword_hits:
+            return None
+        
+        if fold_message(message) in self.known_chatter or probability <= 1 - self.confidence_threshold:
+            return False
+        return None
+    
+    def stats(self) -> dict:
+        """Counts of messages decided locally (Bedrock calls avoided) and deferred."""
+        with self._lock:
+            return {"bedrock_calls_avoided": self.decided, "deferred_to_bedrock": self.deferred}
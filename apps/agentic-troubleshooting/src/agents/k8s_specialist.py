@@ -1,8 +1,17 @@
 """K8s specialist agent with EKS Hosted MCP."""
 from strands import Agent
+from strands.agent.conversation_manager import SlidingWindowConversationManager
 import logging
-from src.tools.k8s_tools import describe_pod, get_pods
+import time
+from typing import Optional
+from src.agents.model_router import ModelRouter
+from src.tools.k8s_tools import describe_pod, diagnose_pods, get_pods, get_warning_summary, scan_pod_logs
+from src.tools.cluster_cache import get_cluster_cache, start_cluster_cache
+from src.tools.output_format import CompactOutputTool
+from src.tools.result_cache import get_tool_result_cache, wrap_tools
+from src.config.aws_clients import get_bedrock_model, get_session
 from src.config.settings import Config
+from src.config.telemetry import ToolTimingHook, record_usage, stage
 from src.prompts import K8S_SPECIALIST_SYSTEM_PROMPT
 from mcp import stdio_client, StdioServerParameters
 from strands.tools.mcp import MCPClient
@@ -13,9 +22,13 @@ logger = logging.getLogger(__name__)
 class K8sSpecialist:
     """K8s troubleshooting specialist with EKS Hosted MCP."""
     
-    def __init__(self):
+    def __init__(self, router: Optional[ModelRouter] = None):
         """Initialize the K8s specialist with EKS Hosted MCP."""
-        tools = [describe_pod, get_pods]
+        tools = [describe_pod, get_pods, get_warning_summary, diagnose_pods, scan_pod_logs]
+        self.router = router
+        
+        # Serve the local tools from watched state instead of the API server
+        start_cluster_cache()
         
         self.eks_mcp_client = None
         self._mcp_connected = False
@@ -25,14 +38,13 @@ class K8sSpecialist:
             try:
                 # Get temporary credentials from Pod Identity and create AWS credentials file
                 import os
-                import boto3
                 
                 home_dir = os.path.expanduser("~")
                 aws_dir = os.path.join(home_dir, ".aws")
                 os.makedirs(aws_dir, exist_ok=True)
                 
                 # Get credentials from boto3 (which uses Pod Identity)
-                session = boto3.Session()
+                session = get_session()
                 credentials = session.get_credentials()
                 frozen_creds = credentials.get_frozen_credentials()
                 
@@ -79,7 +91,12 @@ class K8sSpecialist:
                 
                 self.eks_mcp_client.__enter__()
                 self._mcp_connected = True
-                eks_mcp_tools = self.eks_mcp_client.list_tools_sync()
+                # Local tools win over MCP tools of the same name, strands rejects duplicates
+                local_names = {t.tool_name for t in tools}
+                eks_mcp_tools = [
+                    CompactOutputTool(t) for t in self.eks_mcp_client.list_tools_sync()
+                    if t.tool_name not in local_names
+                ]
                 
                 tools.extend(eks_mcp_tools)
                 logger.info(f"EKS MCP enabled with {len(eks_mcp_tools)} tools")
@@ -90,20 +107,56 @@ class K8sSpecialist:
         
         self.system_prompt = f"{cluster_info}{K8S_SPECIALIST_SYSTEM_PROMPT}"
         
-        self.agent = Agent(
+        # Repeated read-only calls, within a run and across threads, share results
+        result_cache = get_tool_result_cache()
+        self.tools = wrap_tools(tools, result_cache) if result_cache else tools
+    
+    def create_agent(self) -> Agent:
+        """Create a specialist agent with its own bounded conversation history."""
+        return Agent(
             system_prompt=self.system_prompt,
-            model=Config.BEDROCK_MODEL_ID,
-            tools=tools
+            model=get_bedrock_model(Config.BEDROCK_MODEL_ID),
+            tools=self.tools,
+            conversation_manager=SlidingWindowConversationManager(
+                window_size=Config.SESSION_HISTORY_MESSAGES
+            ),
+            hooks=[ToolTimingHook("specialist")]
         )
     
-    def troubleshoot(self, issue: str) -> str:
-        """Troubleshoot a K8s issue with EKS cluster context."""
+    def troubleshoot(self, issue: str, agent: Optional[Agent] = None) -> str:
+        """Troubleshoot a K8s issue with EKS cluster context.
+        
+        Pass the thread's session agent to keep follow-up questions in context,
+        otherwise a one-off agent is used.
+        """
         try:
-            return str(self.agent(issue)).strip()
+            agent = agent or self.create_agent()
+            decision = self.router.route_specialist(issue) if self.router else None
+            agent.model = get_bedrock_model(decision.model_id if decision else Config.BEDROCK_MODEL_ID)
+            
+            prompt = issue
+            if not agent.messages:
+                prompt = self._with_health_snapshot(issue)
+            
+            start = time.perf_counter()
+            with stage("specialist", **{"model.tier": decision.tier if decision else "large"}):
+                result = agent(prompt)
+                record_usage("specialist", agent, result)
+            if decision:
+                self.router.record("specialist", decision, time.perf_counter() - start)
+            return str(result).strip()
         except Exception as e:
             logger.error(f"Error troubleshooting: {e}")
             return "Error during troubleshooting. Please try again."
     
+    def _with_health_snapshot(self, issue: str) -> str:
+        """Prefix a new investigation with the pre-computed cluster health snapshot."""
+        cache = get_cluster_cache()
+        snapshot = cache.health_snapshot() if cache else None
+        if not snapshot:
+            return issue
+        return f"{snapshot}\n\nIssue: {issue}"
+    
     def __del__(self):
         """Clean up MCP connection."""
         if self._mcp_connected and self.eks_mcp_client:
@@ -2,11 +2,17 @@
 
 from strands import Agent, tool
 from strands.multiagent.a2a import A2AServer
-import boto3
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from src.agents.memory_client import format_solutions
+from src.config.aws_clients import get_bedrock_model, get_client
+import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any
+import uvicorn
+from typing import Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +28,7 @@ class MemoryAgentServer:
         
         # Initialize S3 Vectors client
         try:
-            self.s3vectors_client = boto3.client('s3vectors', region_name=self.aws_region)
+            self.s3vectors_client = get_client('s3vectors', self.aws_region)
         except Exception as e:
             logger.error(f"Failed to initialize S3 Vectors client: {e}")
             self.s3vectors_client = None
@@ -42,10 +48,75 @@ class MemoryAgentServer:
             name="Memory Agent",
             description="A memory agent that stores and retrieves K8s troubleshooting solutions using S3 Vectors.",
             system_prompt=memory_prompt,
-            model=self.bedrock_model_id,
+            model=get_bedrock_model(self.bedrock_model_id, self.aws_region),
             tools=[self.store_solution, self.retrieve_solution]
         )
     
+    def _embed(self, text: str) -> list:
+        """Generate a Titan embedding for text."""
+        bedrock = get_client('bedrock-runtime', self.aws_region)
+        response = bedrock.invoke_model(
+            modelId="amazon.titan-embed-text-v2:0",
+            body=json.dumps({"inputText": text})
+        )
+        return json.loads(response["body"].read())["embedding"]
+    
+    def store(self, problem_description: str, solution_steps: str, k8s_resources: str = "") -> Dict[str, Any]:
+        """Store a solution and return its vector key."""
+        if not self.s3vectors_client:
+            raise RuntimeError("S3 Vectors client not available")
+        
+        # Create document content
+        content = f"Problem: {problem_description}\nSolution: {solution_steps}\nResources: {k8s_resources}"
+        
+        # Generate embedding
+        embedding = self._embed(problem_description)
+        
+        # Store in S3 Vectors
+        key = f"solution_{hash(problem_description)}"
+        self.s3vectors_client.put_vectors(
+            vectorBucketName=self.vector_bucket_name,
+            indexName=self.vector_index_name,
+            vectors=[{
+                "key": key,
+                "data": {"float32": embedding},
+                "metadata": {
+                    "content": content,
+                    "problem": problem_description,
+                    "type": "k8s_solution"
+                }
+            }]
+        )
+        return {"key": key}
+    
+    def retrieve(self, problem_query: str, max_results: int = 3) -> List[Dict[str, Any]]:
+        """Return the solutions closest to a problem, nearest first."""
+        if not self.s3vectors_client:
+            raise RuntimeError("S3 Vectors client not available")
+        
+        # Generate query embedding
+        embedding = self._embed(problem_query)
+        
+        # Query vector index
+        response = self.s3vectors_client.query_vectors(
+            vectorBucketName=self.vector_bucket_name,
+            indexName=self.vector_index_name,
+            queryVector={"float32": embedding},
+            topK=max_results,
+            returnDistance=True,
+            returnMetadata=True
+        )
+        
+        return [
+            {
+                "key": vector.get('key'),
+                "distance": vector.get('distance', 0),
+                "problem": vector.get('metadata', {}).get('problem', ''),
+                "content": vector.get('metadata', {}).get('content', 'No content')
+            }
+            for vector in response.get('vectors', [])
+        ]
+    
     @tool
     def store_solution(self, problem_description: str, solution_steps: str, k8s_resources: str = "") -> str:
         """Store a K8s troubleshooting solution in S3 Vectors."""
@@ -53,33 +124,7 @@ class MemoryAgentServer:
             return "S3 Vectors client not available"
         
         try:
-            # Create document content
-            content = f"Problem: {problem_description}\nSolution: {solution_steps}\nResources: {k8s_resources}"
-            
-            # Generate embedding
-            import boto3
-            bedrock = boto3.client('bedrock-runtime', region_name=self.aws_region)
-            response = bedrock.invoke_model(
-                modelId="amazon.titan-embed-text-v2:0",
-                body=json.dumps({"inputText": problem_description})
-            )
-            embedding = json.loads(response["body"].read())["embedding"]
-            
-            # Store in S3 Vectors
-            response = self.s3vectors_client.put_vectors(
-                vectorBucketName=self.vector_bucket_name,
-                indexName=self.vector_index_name,
-                vectors=[{
-                    "key": f"solution_{hash(problem_description)}",
-                    "data": {"float32": embedding},
-                    "metadata": {
-                        "content": content,
-                        "problem": problem_description,
-                        "type": "k8s_solution"
-                    }
-                }]
-            )
-            
+            self.store(problem_description, solution_steps, k8s_resources)
             return f"Solution stored successfully"
             
         except Exception as e:
@@ -93,41 +138,52 @@ class MemoryAgentServer:
             return "S3 Vectors client not available"
         
         try:
-            # Generate query embedding
-            import boto3
-            bedrock = boto3.client('bedrock-runtime', region_name=self.aws_region)
-            response = bedrock.invoke_model(
-                modelId="amazon.titan-embed-text-v2:0",
-                body=json.dumps({"inputText": problem_query})
-            )
-            embedding = json.loads(response["body"].read())["embedding"]
-            
-            # Query vector index
-            response = self.s3vectors_client.query_vectors(
-                vectorBucketName=self.vector_bucket_name,
-                indexName=self.vector_index_name,
-                queryVector={"float32": embedding},
-                topK=max_results,
-                returnDistance=True,
-                returnMetadata=True
-            )
-            
-            if not response.get('vectors'):
-                return "No similar solutions found in memory"
-            
-            # Format results
-            solutions = []
-            for i, vector in enumerate(response['vectors'], 1):
-                metadata = vector['metadata']
-                distance = vector.get('distance', 0)
-                solutions.append(f"*Solution {i}* (Distance: {distance:.2f}):\n{metadata.get('content', 'No content')}")
-            
-            return "\n\n".join(solutions)
+            return format_solutions(self.retrieve(problem_query, max_results))
             
         except Exception as e:
             logger.error(f"Failed to retrieve solutions: {e}")
             return f"Failed to retrieve solutions: {str(e)}"
 
+
+def create_skill_routes(memory_server: MemoryAgentServer) -> List[Route]:
+    """JSON endpoints that call store/retrieve directly, without an LLM in the loop."""
+    
+    async def store_endpoint(request: Request) -> JSONResponse:
+        try:
+            body = await request.json()
+            result = await asyncio.to_thread(
+                memory_server.store,
+                body["problem_description"],
+                body["solution_steps"],
+                body.get("k8s_resources", "")
+            )
+            return JSONResponse(result)
+        except (KeyError, ValueError) as e:
+            return JSONResponse({"error": f"Invalid request: {e}"}, status_code=400)
+        except Exception as e:
+            logger.error(f"Failed to store solution: {e}")
+            return JSONResponse({"error": str(e)}, status_code=500)
+    
+    async def retrieve_endpoint(request: Request) -> JSONResponse:
+        try:
+            body = await request.json()
+            solutions = await asyncio.to_thread(
+                memory_server.retrieve,
+                body["problem_query"],
+                int(body.get("max_results", 3))
+            )
+            return JSONResponse({"solutions": solutions})
+        except (KeyError, ValueError) as e:
+            return JSONResponse({"error": f"Invalid request: {e}"}, status_code=400)
+        except Exception as e:
+            logger.error(f"Failed to retrieve solutions: {e}")
+            return JSONResponse({"error": str(e)}, status_code=500)
+    
+    return [
+        Route("/skills/store_solution", store_endpoint, methods=["POST"]),
+        Route("/skills/retrieve_solution", retrieve_endpoint, methods=["POST"]),
+    ]
+
 def main():
     """Start the Memory Agent A2A server."""
     # Create memory agent server
@@ -136,10 +192,15 @@ def main():
     # Create A2A server
     a2a_server = A2AServer(agent=memory_server.agent)
     
+    # Serve the A2A agent and the direct skill endpoints from the same app
+    app = a2a_server.to_starlette_app()
+    for route in create_skill_routes(memory_server):
+        app.router.routes.append(route)
+    
     print("Starting Memory Agent A2A Server on http://0.0.0.0:9000")
     
     # Start the server - bind to 0.0.0.0 for Kubernetes probes
-    a2a_server.serve(host="0.0.0.0", port=9000)
+    uvicorn.run(app, host="0.0.0.0", port=9000)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+"""Long-lived A2A client for the memory agent server."""
+
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Newer A2A servers publish agent-card.json, older ones agent.json
+AGENT_CARD_PATHS = ["/.well-known/agent-card.json", "/.well-known/agent.json"]
+
+
+class MemorySkillUnavailable(Exception):
+    """The memory server predates the structured skill endpoints."""
+    pass
+
+
+def format_solutions(solutions: List[Dict[str, Any]]) -> str:
+    """Format retrieved solutions for Slack."""
+    if not solutions:
+        return "No similar solutions found in memory"
+    
+    return "\n\n".join(
+        f"*Solution {i}* (Distance: {solution.get('distance', 0):.2f}):\n{solution.get('content', 'No content')}"
+        for i, solution in enumerate(solutions, 1)
+    )
+
+
+class MemoryAgentClient:
+    """Client for the memory server that is created once and reused for every call.
+    
+    retrieve() and store() hit the server's structured skill endpoints, which
+    skip the memory agent's LLM. send_message() talks to the agent over A2A
+    JSON-RPC: the agent card is discovered on first use and cached, and on a
+    failed call it is rediscovered and the call retried once, which covers a
+    restarted memory sidecar. All requests share a keep-alive connection pool.
+    """
+    
+    def __init__(self, base_url: str, timeout: float, max_connections: int):
+        self.base_url = base_url.rstrip("/")
+        self.http = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+        self._card: Optional[dict] = None
+        self._card_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.latencies: Dict[str, deque] = {}
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+    
+    def agent_card(self, refresh: bool = False) -> dict:
+        """Return the memory agent's card, fetching it only when needed."""
+        with self._card_lock:
+            if self._card is None or refresh:
+                self._card = self._discover()
+            return self._card
+    
+    def send_message(self, text: str) -> str:
+        """Send a text message to the memory agent and return its text reply."""
+        def call():
+            try:
+                return self._send(text, self.agent_card())
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Memory agent call failed, refreshing agent card and retrying: {e}")
+                return self._send(text, self.agent_card(refresh=True))
+        
+        return self._timed("a2a", call)
+    
+    def retrieve(self, problem_query: str, max_results: int = 3) -> List[Dict[str, Any]]:
+        """Query the memory server's retrieve_solution endpoint directly."""
+        return self._timed("retrieve", lambda: self._post_skill(
+            "retrieve_solution", {"problem_query": problem_query, "max_results": max_results}
+        )["solutions"])
+    
+    def store(self, problem_description: str, solution_steps: str, k8s_resources: str = "") -> Dict[str, Any]:
+        """Call the memory server's store_solution endpoint directly."""
+        return self._timed("store", lambda: self._post_skill("store_solution", {
+            "problem_description": problem_description,
+            "solution_steps": solution_steps,
+            "k8s_resources": k8s_resources
+        }))
+    
+    def stats(self) -> dict:
+        """Call counts and latency percentiles over the most recent calls, per operation."""
+        with self._stats_lock:
+            snapshot = {op: (sorted(samples), self.calls[op], self.errors[op]) for op, samples in self.latencies.items()}
+        
+        result = {}
+        for op, (samples, calls, errors) in snapshot.items():
+            result[op] = {
+                "calls": calls,
+                "errors": errors,
+                "p50_seconds": round(samples[len(samples) // 2], 3),
+                "p95_seconds": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3)
+            }
+        return result
+    
+    def _timed(self, op: str, call: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return call()
+        except Exception:
+            with self._stats_lock:
+                self.errors[op] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.calls[op] += 1
+                self.latencies.setdefault(op, deque(maxlen=500)).append(elapsed)
+            logger.info(f"Memory agent {op} call took {elapsed:.2f}s")
+    
+    def _post_skill(self, skill: str, payload: dict) -> dict:
+        response = self.http.post(f"{self.base_url}/skills/{skill}", json=payload)
+        if response.status_code == 404:
+            raise MemorySkillUnavailable(f"Memory server does not expose /skills/{skill}")
+        if response.status_code >= 400:
+            try:
+                error = response.json().get("error", response.text)
+            except ValueError:
+                error = response.text
+            raise RuntimeError(f"Memory {skill} failed with HTTP {response.status_code}: {error}")
+        return response.json()
+    
+    def close(self):
+        """Close pooled connections."""
+        self.http.close()
+    
+    def _discover(self) -> dict:
+        last_error = None
+        for path in AGENT_CARD_PATHS:
+            try:
+                response = self.http.get(f"{self.base_url}{path}")
+                if response.status_code == 200:
+                    card = response.json()
+                    logger.info(f"Discovered memory agent '{card.get('name')}' at {self.base_url}{path}")
+                    return card
+                last_error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                last_error = str(e)
+        raise ValueError(f"Could not discover memory agent card at {self.base_url}: {last_error}")
+    
+    def _endpoint(self, card: dict) -> str:
+        # The card may advertise the server's bind address, so keep our host and only use its path
+        path = urlparse(card.get("url", "")).path
+        return f"{self.base_url}{path}" if path and path != "/" else f"{self.base_url}/"
+    
+    def _send(self, text: str, card: dict) -> str:
+        payload = {
+            "jsonrpc": "2.0",
+            "id": str(uuid.uuid4()),
+            "method": "message/send",
+            "params": {
+                "message": {
+                    "kind": "message",
+                    "role": "user",
+                    "messageId": uuid.uuid4().hex,
+                    "parts": [{"kind": "text", "text": text}]
+                }
+            }
+        }
+        response = self.http.post(self._endpoint(card), json=payload)
+        response.raise_for_status()
+        data = response.json()
+        
+        if "error" in data:
+            raise ValueError(f"Memory agent error: {data['error']}")
+        return self._result_text(data.get("result", {}))
+    
+    def _result_text(self, result: dict) -> str:
+        """Collect text parts from a Message or Task result."""
+        if result.get("kind") == "task" or "artifacts" in result:
+            parts = [part for artifact in result.get("artifacts") or [] for part in artifact.get("parts", [])]
+            if not parts:
+                parts = ((result.get("status") or {}).get("message") or {}).get("parts", [])
+        else:
+            parts = result.get("parts", [])
+        return "\n".join(part.get("text", "") for part in parts if part.get("text")).strip()
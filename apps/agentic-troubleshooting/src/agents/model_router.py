@@ -0,0 +1,116 @@
+"""Per-request model tier selection for the orchestrator and specialist agents."""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, NamedTuple, Optional
+from src.agents.classifier import has_technical_signal, tokenize
+
+logger = logging.getLogger(__name__)
+
+FAST = "fast"
+LARGE = "large"
+
+# Plain lookups: "list pods in default", "show deployments in payments"
+_LOOKUP = re.compile(
+    r"^\s*(?:please\s+)?(?:list|show|get|display|what|which|how many|count)\b.*"
+    r"\b(?:pods?|deployments?|services?|svc|nodes?|namespaces?|events?|replicasets?|configmaps?)\b",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Words that mean the user wants reasoning, not a lookup
+_DIAGNOSTIC = re.compile(
+    r"\b(?:why|debug|diagnos\w*|troubleshoot\w*|investigat\w*|root cause|fix\w*|failing|failed|"
+    r"crash\w*|error\w*|oom\w*|pending|stuck|slow|latency|broken|not working|backoff|evict\w*)\b",
+    re.IGNORECASE
+)
+
+
+class RoutingDecision(NamedTuple):
+    """Model chosen for one agent invocation and why."""
+    tier: str
+    model_id: str
+    reason: str
+
+
+class ModelRouter:
+    """Routes simple lookups and memory relays to a fast model.
+    
+    Multi-step diagnosis stays on the large model. Observed latency is tracked
+    per agent and tier so each fast-tier call can log the time it saved
+    against the large model's running average.
+    """
+    
+    def __init__(self, fast_model_id: str, large_model_id: str, enabled: bool = True,
+                 max_simple_words: int = 25):
+        self.fast_model_id = fast_model_id
+        self.large_model_id = large_model_id
+        self.enabled = bool(enabled and fast_model_id and fast_model_id != large_model_id)
+        self.max_simple_words = max_simple_words
+        self._lock = threading.Lock()
+        self._latency: Dict[tuple, float] = {}
+        self._counts: Dict[tuple, int] = {}
+        self._saved_seconds = 0.0
+    
+    def route_orchestrator(self, message: str, context: Optional[str] = None,
+                           memory_hit: bool = False) -> RoutingDecision:
+        """Pick the orchestrator model from the classifier signals, complexity and memory result."""
+        if not self.enabled:
+            return self._large("routing disabled")
+        if memory_hit and not has_technical_signal(message):
+            return self._fast("memory already has a close solution")
+        return self._by_complexity(message, context)
+    
+    def route_specialist(self, query: str) -> RoutingDecision:
+        """Pick the specialist model for one troubleshooting query."""
+        if not self.enabled:
+            return self._large("routing disabled")
+        return self._by_complexity(query)
+    
+    def _by_complexity(self, message: str, context: Optional[str] = None) -> RoutingDecision:
+        if has_technical_signal(message):
+            return self._large("pasted diagnostic output")
+        if context:
+            return self._large("follow-up in a thread")
+        if len(tokenize(message)) > self.max_simple_words or message.count("?") > 1:
+            return self._large("long or multi-part request")
+        if _DIAGNOSTIC.search(message):
+            return self._large("diagnosis requested")
+        if _LOOKUP.search(message):
+            return self._fast("simple lookup")
+        return self._large("no simple-lookup match")
+    
+    def _fast(self, reason: str) -> RoutingDecision:
+        return RoutingDecision(FAST, self.fast_model_id, reason)
+    
+    def _large(self, reason: str) -> RoutingDecision:
+        return RoutingDecision(LARGE, self.large_model_id, reason)
+    
+    def record(self, agent_name: str, decision: RoutingDecision, seconds: float):
+        """Log the decision with its latency and the time saved against the large tier."""
+        with self._lock:
+            key = (agent_name, decision.tier)
+            previous = self._latency.get(key)
+            # Exponentially weighted so the baseline follows current Bedrock latency
+            self._latency[key] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+            self._counts[key] = self._counts.get(key, 0) + 1
+            
+            saved = None
+            baseline = self._latency.get((agent_name, LARGE))
+            if decision.tier == FAST and baseline is not None:
+                saved = baseline - seconds
+                self._saved_seconds += saved
+        
+        message = (f"Model routing for {agent_name}: {decision.tier} ({decision.model_id}) "
+                   f"because {decision.reason}, took {seconds:.2f}s")
+        if saved is not None:
+            message += f", saved ~{saved:.2f}s against the large model"
+        logger.info(message)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Calls per agent and tier, and the estimated total latency saved."""
+        with self._lock:
+            return {
+                "calls": {f"{agent}:{tier}": count for (agent, tier), count in self._counts.items()},
+                "latency_saved_seconds": round(self._saved_seconds, 2)
+            }
@@ -0,0 +1,116 @@
+"""Semantic cache of recent orchestrator answers, keyed by message embedding."""
+
+import json
+import logging
+import math
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from src.config.aws_clients import get_client
+from src.utils.text import fold_message, resource_identifiers
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL_ID = "amazon.titan-embed-text-v2:0"
+EMBEDDING_DIMENSIONS = 256
+
+
+class CacheLookup(NamedTuple):
+    """Outcome of a cache lookup, kept so a miss can be stored without embedding twice."""
+    key: str
+    embedding: Optional[List[float]]
+    response: Optional[str] = None
+    similarity: float = 0.0
+    identifiers: frozenset = frozenset()
+
+
+def titan_embedding(text: str) -> List[float]:
+    """Generate a small normalized Titan embedding for similarity matching."""
+    bedrock = get_client('bedrock-runtime')
+    response = bedrock.invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        body=json.dumps({"inputText": text, "dimensions": EMBEDDING_DIMENSIONS, "normalize": True})
+    )
+    return json.loads(response["body"].read())["embedding"]
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
+
+
+class SemanticResponseCache:
+    """Answers near-duplicate questions with a recent response.
+    
+    Entries live for a short TTL so answers never outlast the cluster state
+    they describe. Lookups try the case- and whitespace-folded text first,
+    then compare the message embedding by cosine similarity against live
+    entries that mention exactly the same resource identifiers.
+    """
+    
+    def __init__(self, embed: Callable[[str], List[float]], similarity_threshold: float,
+                 ttl_seconds: float, max_entries: int):
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self._entries = TTLCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+        self._lock = threading.Lock()
+        self._exact_hits = 0
+        self._semantic_hits = 0
+        self._misses = 0
+    
+    def lookup(self, message: str) -> CacheLookup:
+        """Find a cached answer for message; the result carries the embedding for a later store."""
+        # Not normalize_message: its masks would make questions about different
+        # nodes, pods or versions share an answer
+        key = fold_message(message)
+        identifiers = resource_identifiers(message)
+        entry = self._entries.get(key)
+        if entry is not None:
+            embedding, _, response = entry
+            self._count("_exact_hits")
+            return CacheLookup(key, embedding, response, 1.0, identifiers)
+        
+        embedding = _unit(self.embed(message))
+        best_response, best_similarity = None, 0.0
+        for _, (vector, entry_identifiers, response) in self._entries.items():
+            # Questions about different pods, namespaces or nodes embed almost
+            # identically, so only entries naming the same objects can match
+            if entry_identifiers != identifiers:
+                continue
+            similarity = sum(a * b for a, b in zip(embedding, vector))
+            if similarity > best_similarity:
+                best_response, best_similarity = response, similarity
+        
+        if best_similarity >= self.similarity_threshold:
+            self._count("_semantic_hits")
+            return CacheLookup(key, embedding, best_response, best_similarity, identifiers)
+        
+        self._count("_misses")
+        return CacheLookup(key, embedding, similarity=best_similarity, identifiers=identifiers)
+    
+    def store(self, lookup: CacheLookup, response: str):
+        """Remember the answer given for a looked-up message."""
+        if lookup.embedding is None or not response:
+            return
+        self._entries.set(lookup.key, (lookup.embedding, lookup.identifiers, response))
+    
+    def clear(self):
+        """Drop every cached answer."""
+        self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate counters."""
+        with self._lock:
+            hits = self._exact_hits + self._semantic_hits
+            total = hits + self._misses
+            return {
+                "size": len(self._entries),
+                "exact_hits": self._exact_hits,
+                "semantic_hits": self._semantic_hits,
+                "misses": self._misses,
+                "hit_rate": hits / total if total else 0.0
+            }
+    
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
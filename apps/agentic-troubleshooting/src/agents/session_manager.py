@@ -0,0 +1,62 @@
+"""Per-thread conversation sessions for the orchestrator and specialist agents."""
+
+import logging
+from typing import Any, Callable, List, Optional
+from src.config.settings import Config
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ConversationSession:
+    """Agents and history belonging to one Slack thread."""
+    
+    def __init__(self, key: str, orchestrator_agent: Any, specialist_agent: Any):
+        self.key = key
+        self.orchestrator_agent = orchestrator_agent
+        self.specialist_agent = specialist_agent
+
+
+class SessionManager:
+    """Keeps one ConversationSession per channel:thread_ts key.
+    
+    Sessions are evicted least-recently-used once MAX_SESSIONS is reached and
+    after SESSION_TTL_SECONDS of inactivity. Each agent keeps a sliding window
+    of SESSION_HISTORY_MESSAGES messages, so total memory stays bounded.
+    """
+    
+    def __init__(self, create_session: Callable[[str], ConversationSession]):
+        self.create_session = create_session
+        self._evict_listeners: List[Callable[[str], None]] = []
+        self.sessions = TTLCache(
+            max_size=Config.MAX_SESSIONS,
+            ttl_seconds=Config.SESSION_TTL_SECONDS,
+            on_evict=self._on_evict
+        )
+    
+    def get(self, key: str) -> ConversationSession:
+        """Return the session for a thread, creating it on first use."""
+        session = self.sessions.get_or_create(key, lambda: self._create(key))
+        # Activity keeps the session alive
+        self.sessions.touch(key)
+        return session
+    
+    def end(self, key: str) -> Optional[ConversationSession]:
+        """Drop a thread's session."""
+        return self.sessions.pop(key)
+    
+    def add_evict_listener(self, listener: Callable[[str], None]):
+        """Call listener(key) whenever a session is evicted or ended."""
+        self._evict_listeners.append(listener)
+    
+    def _create(self, key: str) -> ConversationSession:
+        logger.info(f"Creating conversation session for {key}")
+        return self.create_session(key)
+    
+    def _on_evict(self, key: str, session: ConversationSession):
+        logger.info(f"Evicted conversation session for {key}")
+        for listener in self._evict_listeners:
+            try:
+                listener(key)
+            except Exception as e:
+                logger.error(f"Session evict listener failed for {key}: {e}")
@@ -0,0 +1,386 @@
+"""Asyncio Slack handler for the K8s troubleshooting agent."""
+
+import asyncio
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
+from slack_sdk.web.async_client import AsyncWebClient
+
+from src.config.settings import Config
+from src.config.telemetry import stage
+from src.agents.agent_orchestrator import AgentSilentException
+from src.slack_handler import SlackHandlerBase
+from src.slack_stream import AsyncSlackStreamWriter
+from src.utils.debouncer import AsyncMessageDebouncer
+
+logger = logging.getLogger(__name__)
+
+
+class _ThreadLock:
+    """asyncio.Lock shared by the tasks of one Slack thread."""
+    
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class AsyncSlackHandler(SlackHandlerBase):
+    """Handles Slack events on a single event loop.
+    
+    Slack I/O is fully async. Orchestrator runs block on Bedrock, the memory
+    agent and the Kubernetes API, so they go to a bounded thread pool of
+    WORKER_POOL_SIZE threads. Waiting threads only cost a coroutine, which lets
+    one process follow hundreds of Slack threads at once.
+    """
+    
+    def __init__(self):
+        """Initialize async Slack handler and K8s agent."""
+        super().__init__()
+        
+        # Initialize Slack app
+        self.app = AsyncApp(
+            token=Config.SLACK_BOT_TOKEN,
+            signing_secret=Config.SLACK_SIGNING_SECRET
+        )
+        
+        # Orchestrator calls are blocking, so run them on a bounded pool
+        self.executor = ThreadPoolExecutor(
+            max_workers=Config.WORKER_POOL_SIZE,
+            thread_name_prefix="orchestrator"
+        )
+        
+        # One response at a time per Slack thread
+        self.thread_locks: Dict[str, _ThreadLock] = {}
+        self.pending = 0
+        self._tasks = set()
+        
+        # Merge quick follow-up messages from the same user into one request
+        self.debouncer = AsyncMessageDebouncer(
+            delay_seconds=Config.RESPONSE_DELAY_SECONDS,
+            flush=self._dispatch_messages
+        )
+    
+    async def _register_handlers(self):
+        """Register Slack event handlers."""
+        # Get bot user ID once during initialization
+        bot_user_id = (await self.app.client.auth_test())['user_id']
+        logger.info(f"Bot user ID: {bot_user_id} - Registering event handlers...")
+        
+        # Handle messages (excluding bot messages)
+        @self.app.event("message")
+        async def handle_message(body, event, say, client: AsyncWebClient):
+            """Handle incoming messages."""
+            try:
+                # Skip if this is a message_changed or message_deleted event
+                subtype = event.get("subtype")
+                if subtype:
+                    logger.info(f"Skipping message with subtype: {subtype}")
+                    return
+                
+                # Skip Slack retries and duplicate deliveries
+                if self._is_duplicate(body, event):
+                    return
+                
+                if self._skip_message(event, bot_user_id):
+                    return
+                
+                # Wait for the user to finish typing, then respond in the background
+                self.debouncer.add(self._debounce_key(event), (event, say, client))
+                
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+                await say(
+                    text="Sorry, I encountered an error processing your message.",
+                    thread_ts=event.get("thread_ts", event.get("ts"))
+                )
+        
+        # Handle app mentions
+        @self.app.event("app_mention")
+        async def handle_mention(body, event, say, client: AsyncWebClient):
+            """Handle direct mentions."""
+            try:
+                # Skip Slack retries and duplicate deliveries
+                if self._is_duplicate(body, event):
+                    return
+                
+                text = event.get("text", "")
+                user = event.get("user", "")
+                thread_ts = event.get("thread_ts", event.get("ts"))
+                
+                logger.info(f"App mention received - User: {user}, Text: {text[:50]}...")
+                
+                # Skip if mention is from the bot itself (shouldn't happen, but just in case)
+                if user == bot_user_id:
+                    logger.info("Skipping bot's own mention")
+                    return
+                
+                # Respond in the background so the event is acked immediately
+                channel = event.get("channel", "")
+                thread_key = f"{channel}:{thread_ts}"
+                if not self._submit(thread_key, self._process_mention(event, say, client, bot_user_id)):
+                    await say(
+                        text="I'm handling a lot of requests right now. Please try again in a moment.",
+                        thread_ts=thread_ts
+                    )
+                
+            except Exception as e:
+                logger.error(f"Error handling mention: {e}")
+                await say(
+                    text="Sorry, I encountered an error processing your request.",
+                    thread_ts=event.get("thread_ts", event.get("ts"))
+                )
+    
+    def _submit(self, thread_key: str, coro) -> bool:
+        """Schedule a coroutine behind earlier work for the same thread.
+        
+        Returns False (and closes the coroutine) when MAX_PENDING_EVENTS are
+        already queued or running.
+        """
+        if self.pending >= Config.MAX_PENDING_EVENTS:
+            logger.warning(f"Too many pending events ({self.pending}), rejecting task for {thread_key}")
+            coro.close()
+            return False
+        
+        self.pending += 1
+        thread_lock = self.thread_locks.setdefault(thread_key, _ThreadLock())
+        thread_lock.users += 1
+        
+        async def run():
+            try:
+                async with thread_lock.lock:
+                    await coro
+            except Exception as e:
+                logger.error(f"Task failed for {thread_key}: {e}")
+            finally:
+                self.pending -= 1
+                thread_lock.users -= 1
+                if not thread_lock.users:
+                    self.thread_locks.pop(thread_key, None)
+        
+        # Keep a reference so the task isn't garbage collected mid-flight
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+    
+    async def _dispatch_messages(self, debounce_key: str, pending: List[tuple]):
+        """Merge a burst of messages and queue a single response for it."""
+        event = self._merge_events([item[0] for item in pending])
+        _, say, client = pending[-1]
+        
+        channel = event.get("channel", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        thread_key = f"{channel}:{thread_ts}"
+        if not self._submit(thread_key, self._process_message(event, say, client)):
+            # Passive messages may not even be K8s related, so drop them quietly
+            logger.warning(f"Dropping message for {thread_key}: too many pending events")
+    
+    async def _process_message(self, event, say, client: AsyncWebClient):
+        """Generate and send a response for a channel or thread message."""
+        text = event.get("text", "")
+        channel = event.get("channel", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        
+        try:
+            context = await self._thread_context(client, event)
+            
+            # Get response from agent with thread_id for memory
+            thread_key = f"{channel}:{thread_ts}"
+            if Config.ENABLE_STREAMING:
+                logger.info("Streaming response from agent...")
+                response = await self.respond_streaming(text, thread_key, client, channel, thread_ts, context)
+                
+                # Didnt pass the callback validation mechanism
+                if not response:
+                    return None
+                
+                logger.info(f"Streamed response sent: {len(response)} characters")
+            else:
+                logger.info("Generating response from agent...")
+                response = await self.respond(text, thread_key, context)
+                
+                # Didnt pass the callback validation mechanism
+                if not response:
+                    return None
+                
+                logger.info(f"Agent response generated: {len(response)} characters")
+                
+                # Send response in thread
+                logger.info(f"Sending response to thread: {thread_ts}")
+                with stage("slack_post"):
+                    await say(
+                        text=response,
+                        thread_ts=thread_ts
+                    )
+                logger.info("Response sent successfully")
+            
+            # Mark this thread as active
+            self.active_threads.add(thread_key)
+            logger.info(f"Added thread to active threads: {thread_key}")
+            
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            await say(
+                text="Sorry, I encountered an error processing your message.",
+                thread_ts=thread_ts
+            )
+    
+    async def _process_mention(self, event, say, client: AsyncWebClient, bot_user_id: str):
+        """Generate and send a response for a direct mention."""
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        
+        try:
+            # Remove mention from text
+            text = event.get("text", "").replace(f"<@{bot_user_id}>", "").strip()
+            
+            context = await self._thread_context(client, event)
+            
+            # Get response from agent with thread_id for memory
+            channel = event.get("channel", "")
+            thread_key = f"{channel}:{thread_ts}"
+            if Config.ENABLE_STREAMING:
+                logger.info("Streaming response for mention...")
+                response = await self.respond_streaming(text, thread_key, client, channel, thread_ts, context)
+            else:
+                logger.info("Generating response for mention...")
+                response = await self.respond(text, thread_key, context)
+            
+            # Ensure response is not empty (a streamed response has already been posted)
+            if not response or not response.strip():
+                logger.warning("Empty response detected, using fallback")
+                await say(
+                    text="I'm here to help with Kubernetes troubleshooting. How can I assist you?",
+                    thread_ts=thread_ts
+                )
+            elif not Config.ENABLE_STREAMING:
+                logger.info(f"Mention response generated: {len(response)} characters")
+                
+                # Send response in thread
+                logger.info(f"Sending mention response to thread: {thread_ts}")
+                with stage("slack_post"):
+                    await say(
+                        text=response,
+                        thread_ts=thread_ts
+                    )
+            logger.info("Mention response sent successfully")
+            
+            # Mark this thread as active
+            self.active_threads.add(thread_key)
+            logger.info(f"Added thread to active threads: {thread_key}")
+            
+        except Exception as e:
+            logger.error(f"Error processing mention: {e}")
+            await say(
+                text="Sorry, I encountered an error processing your request.",
+                thread_ts=thread_ts
+            )
+    
+    async def _thread_context(self, client: AsyncWebClient, event) -> Optional[str]:
+        """Get earlier messages of the event's thread if thread context is enabled."""
+        thread_ts = event.get("thread_ts")
+        if not Config.ENABLE_THREAD_CONTEXT or not thread_ts or thread_ts == event.get("ts"):
+            return None
+        
+        try:
+            with stage("slack_context"):
+                return await self.thread_context.aget_context(
+                    client, event.get("channel", ""), thread_ts, event.get("ts")
+                )
+        except Exception as e:
+            logger.error(f"Error getting thread context: {e}")
+            return None
+    
+    async def start(self):
+        """Start the Slack handler."""
+        try:
+            await self._register_handlers()
+            
+            # Start socket mode handler
+            handler = AsyncSocketModeHandler(self.app, Config.SLACK_APP_TOKEN)
+            logger.info("Starting async Slack handler...")
+            await handler.start_async()
+        except Exception as e:
+            logger.error(f"Error starting Slack handler: {e}")
+            raise
+        finally:
+            self.debouncer.cancel_all()
+            self.executor.shutdown(wait=False)
+            self.active_threads.snapshot()
+    
+    async def respond(self, message: str, thread_id: str, context: str = None) -> Optional[str]:
+        """Main entry point for responses."""
+        loop = asyncio.get_running_loop()
+        try:
+            with stage("orchestrator"):
+                agent_response = await loop.run_in_executor(
+                    self.executor, contextvars.copy_context().run,
+                    self.orchestrator.invoke, message, thread_id, context
+                )
+            return self._response_text(agent_response)
+        except AgentSilentException:
+            return None  # Return None to indicate no response should be sent
+        except Exception as e:
+            logger.error(f"Orchestrator error: {e}")
+            return "Error processing request. Please try again."
+    
+    async def respond_streaming(self, message: str, thread_id: str, client: AsyncWebClient,
+                                channel: str, thread_ts: str, context: str = None) -> Optional[str]:
+        """Stream the response into a placeholder message that is edited as text arrives."""
+        writer = AsyncSlackStreamWriter(client, channel, thread_ts, Config.STREAM_UPDATE_INTERVAL_SECONDS)
+        
+        try:
+            result = None
+            with stage("orchestrator"):
+                async for event in self._stream_events(message, thread_id, context):
+                    if "data" in event:
+                        await writer.append(event["data"])
+                    elif "result" in event:
+                        result = event["result"]
+                    else:
+                        await writer.start()
+            response = self._response_text(result)
+        except AgentSilentException:
+            await writer.discard()
+            return None  # Return None to indicate no response should be sent
+        except Exception as e:
+            logger.error(f"Orchestrator error: {e}")
+            response = "Error processing request. Please try again."
+        
+        with stage("slack_post"):
+            await writer.finish(response)
+        return response
+    
+    async def _stream_events(self, message: str, thread_id: str, context: str = None) -> AsyncIterator[dict]:
+        """Run the orchestrator stream on the executor and yield its events on this loop.
+        
+        The classification hook and tool calls block, so the stream is driven
+        from a worker thread rather than from the Slack event loop.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+        
+        def produce():
+            async def consume():
+                async for event in self.orchestrator.stream(message, thread_id, context):
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+            try:
+                asyncio.run(consume())
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+        
+        # run_in_executor does not carry contextvars, so the stage span would not
+        # parent the orchestrator's spans without an explicit copy
+        future = loop.run_in_executor(self.executor, contextvars.copy_context().run, produce)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await future
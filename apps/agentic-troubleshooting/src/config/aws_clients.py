@@ -0,0 +1,77 @@
+"""Shared, tuned boto3 clients and Bedrock models."""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+import boto3
+from botocore.config import Config as BotoConfig
+from src.config.settings import Config
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_sessions: Dict[Optional[str], boto3.Session] = {}
+_clients: Dict[Tuple[str, str], object] = {}
+_models: Dict[Tuple[str, str], object] = {}
+
+
+def client_config() -> BotoConfig:
+    """botocore settings used by every client: pool size, adaptive retries and timeouts."""
+    return BotoConfig(
+        max_pool_connections=Config.AWS_MAX_POOL_CONNECTIONS,
+        retries={"max_attempts": Config.AWS_MAX_ATTEMPTS, "mode": "adaptive"},
+        connect_timeout=Config.AWS_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=Config.AWS_READ_TIMEOUT_SECONDS,
+        tcp_keepalive=True
+    )
+
+
+def get_session(region: Optional[str] = None) -> boto3.Session:
+    """Process-wide boto3 session, one per region (None uses the default region chain)."""
+    with _lock:
+        if region not in _sessions:
+            _sessions[region] = boto3.Session(region_name=region)
+        return _sessions[region]
+
+
+def get_client(service: str, region: Optional[str] = None):
+    """Return the shared client for a service and region, creating it on first use.
+    
+    boto3 clients are thread-safe, but creating them from a shared session is
+    not, so creation happens under a lock and the client is reused afterwards.
+    """
+    region = region or Config.AWS_REGION
+    key = (service, region)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    
+    session = get_session()
+    with _lock:
+        if key not in _clients:
+            logger.info(f"Creating shared {service} client for {region}")
+            _clients[key] = session.client(service, region_name=region, config=client_config())
+        return _clients[key]
+
+
+def get_bedrock_model(model_id: str, region: Optional[str] = None):
+    """Return a shared strands BedrockModel so agents reuse one bedrock-runtime client."""
+    from strands.models import BedrockModel
+    
+    region = region or Config.AWS_REGION
+    key = (model_id, region)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    
+    # BedrockModel rejects region_name together with boto_session, so the region
+    # comes from the session
+    session = get_session(region)
+    with _lock:
+        if key not in _models:
+            _models[key] = BedrockModel(
+                model_id=model_id,
+                boto_session=session,
+                boto_client_config=client_config()
+            )
+        return _models[key]
@@ -36,6 +36,22 @@ class Config:
     def MEMORY_AGENT_SERVER_URL(self) -> str:
         return os.getenv('MEMORY_AGENT_SERVER_URL', 'http://127.0.0.1:9000')
     
+    @property
+    def MEMORY_AGENT_TIMEOUT_SECONDS(self) -> float:
+        return float(os.getenv('MEMORY_AGENT_TIMEOUT_SECONDS', '120'))
+    
+    @property
+    def MEMORY_AGENT_MAX_CONNECTIONS(self) -> int:
+        return int(os.getenv('MEMORY_AGENT_MAX_CONNECTIONS', '10'))
+    
+    @property
+    def ENABLE_MEMORY_PREFETCH(self) -> bool:
+        return os.getenv('ENABLE_MEMORY_PREFETCH', 'true').lower() == 'true'
+    
+    @property
+    def MEMORY_PREFETCH_TIMEOUT_SECONDS(self) -> float:
+        return float(os.getenv('MEMORY_PREFETCH_TIMEOUT_SECONDS', '10'))
+    
     @property
     def SLACK_BOT_TOKEN(self) -> str:
         return os.getenv('SLACK_BOT_TOKEN', '')
@@ -56,6 +72,22 @@ class Config:
     def BEDROCK_MODEL_ID(self) -> str:
         return os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
     
+    @property
+    def FAST_MODEL_ID(self) -> str:
+        return os.getenv('FAST_MODEL_ID', 'anthropic.claude-3-haiku-20240307-v1:0')
+    
+    @property
+    def ENABLE_MODEL_ROUTING(self) -> bool:
+        return os.getenv('ENABLE_MODEL_ROUTING', 'false').lower() == 'true'
+    
+    @property
+    def MODEL_ROUTING_MAX_SIMPLE_WORDS(self) -> int:
+        return int(os.getenv('MODEL_ROUTING_MAX_SIMPLE_WORDS', '25'))
+    
+    @property
+    def MODEL_ROUTING_MEMORY_MAX_DISTANCE(self) -> float:
+        return float(os.getenv('MODEL_ROUTING_MEMORY_MAX_DISTANCE', '0.3'))
+    
     @property
     def AGENT_NAME(self) -> str:
         return os.getenv('AGENT_NAME', 'strands-slack-agent')
@@ -111,6 +143,199 @@ class Config:
     def ALLOW_WRITE(self) -> bool:
         return os.getenv('ALLOW_WRITE', 'true').lower() == 'true'
 
+    # AWS Client Properties
+    @property
+    def AWS_MAX_POOL_CONNECTIONS(self) -> int:
+        return int(os.getenv('AWS_MAX_POOL_CONNECTIONS', '50'))
+
+    @property
+    def AWS_MAX_ATTEMPTS(self) -> int:
+        return int(os.getenv('AWS_MAX_ATTEMPTS', '5'))
+
+    @property
+    def AWS_CONNECT_TIMEOUT_SECONDS(self) -> float:
+        return float(os.getenv('AWS_CONNECT_TIMEOUT_SECONDS', '5'))
+
+    @property
+    def AWS_READ_TIMEOUT_SECONDS(self) -> float:
+        return float(os.getenv('AWS_READ_TIMEOUT_SECONDS', '120'))
+
+    # Cluster Cache Properties
+    @property
+    def ENABLE_CLUSTER_CACHE(self) -> bool:
+        return os.getenv('ENABLE_CLUSTER_CACHE', 'true').lower() == 'true'
+
+    @property
+    def CLUSTER_CACHE_MAX_EVENTS(self) -> int:
+        return int(os.getenv('CLUSTER_CACHE_MAX_EVENTS', '20000'))
+
+    @property
+    def CLUSTER_CACHE_EVENT_MAX_AGE_SECONDS(self) -> int:
+        return int(os.getenv('CLUSTER_CACHE_EVENT_MAX_AGE_SECONDS', '3600'))
+
+    @property
+    def CLUSTER_CACHE_MAX_STALENESS_SECONDS(self) -> float:
+        return float(os.getenv('CLUSTER_CACHE_MAX_STALENESS_SECONDS', '180'))
+
+    @property
+    def CLUSTER_CACHE_WATCH_TIMEOUT_SECONDS(self) -> int:
+        return int(os.getenv('CLUSTER_CACHE_WATCH_TIMEOUT_SECONDS', '300'))
+
+    @property
+    def ENABLE_HEALTH_SNAPSHOT(self) -> bool:
+        return os.getenv('ENABLE_HEALTH_SNAPSHOT', 'true').lower() == 'true'
+
+    @property
+    def HEALTH_SNAPSHOT_INTERVAL_SECONDS(self) -> float:
+        return float(os.getenv('HEALTH_SNAPSHOT_INTERVAL_SECONDS', '30'))
+
+    @property
+    def HEALTH_SNAPSHOT_TOKEN_BUDGET(self) -> int:
+        return int(os.getenv('HEALTH_SNAPSHOT_TOKEN_BUDGET', '500'))
+
+    @property
+    def DIAGNOSE_MAX_WORKERS(self) -> int:
+        return int(os.getenv('DIAGNOSE_MAX_WORKERS', '8'))
+
+    @property
+    def LOG_MAX_TAIL_LINES(self) -> int:
+        return int(os.getenv('LOG_MAX_TAIL_LINES', '5000'))
+
+    @property
+    def LOG_LIMIT_BYTES(self) -> int:
+        return int(os.getenv('LOG_LIMIT_BYTES', str(2 * 1024 * 1024)))
+
+    @property
+    def LOG_RETURN_TAIL_LINES(self) -> int:
+        return int(os.getenv('LOG_RETURN_TAIL_LINES', '20'))
+
+    @property
+    def TOOL_OUTPUT_TOKEN_BUDGET(self) -> int:
+        return int(os.getenv('TOOL_OUTPUT_TOKEN_BUDGET', '2000'))
+
+    @property
+    def ENABLE_TOOL_RESULT_CACHE(self) -> bool:
+        return os.getenv('ENABLE_TOOL_RESULT_CACHE', 'true').lower() == 'true'
+
+    @property
+    def TOOL_RESULT_CACHE_TTL_SECONDS(self) -> float:
+        return float(os.getenv('TOOL_RESULT_CACHE_TTL_SECONDS', '20'))
+
+    @property
+    def TOOL_RESULT_CACHE_SIZE(self) -> int:
+        return int(os.getenv('TOOL_RESULT_CACHE_SIZE', '500'))
+
+    # Streaming Properties
+    @property
+    def ENABLE_STREAMING(self) -> bool:
+        return os.getenv('ENABLE_STREAMING', 'false').lower() == 'true'
+
+    @property
+    def STREAM_UPDATE_INTERVAL_SECONDS(self) -> float:
+        return float(os.getenv('STREAM_UPDATE_INTERVAL_SECONDS', '1.5'))
+
+    # Concurrency Properties
+    @property
+    def SLACK_ASYNC_MODE(self) -> bool:
+        return os.getenv('SLACK_ASYNC_MODE', 'false').lower() == 'true'
+
+    @property
+    def WORKER_POOL_SIZE(self) -> int:
+        return int(os.getenv('WORKER_POOL_SIZE', '8'))
+
+    @property
+    def MAX_PENDING_EVENTS(self) -> int:
+        return int(os.getenv('MAX_PENDING_EVENTS', '100'))
+
+    @property
+    def EVENT_DEDUP_TTL_SECONDS(self) -> int:
+        return int(os.getenv('EVENT_DEDUP_TTL_SECONDS', '600'))
+
+    @property
+    def EVENT_DEDUP_MAX_SIZE(self) -> int:
+        return int(os.getenv('EVENT_DEDUP_MAX_SIZE', '10000'))
+
+    # Session Properties
+    @property
+    def MAX_SESSIONS(self) -> int:
+        return int(os.getenv('MAX_SESSIONS', '200'))
+
+    @property
+    def SESSION_TTL_SECONDS(self) -> int:
+        return int(os.getenv('SESSION_TTL_SECONDS', '3600'))
+
+    @property
+    def SESSION_HISTORY_MESSAGES(self) -> int:
+        return int(os.getenv('SESSION_HISTORY_MESSAGES', '20'))
+
+    # Classification Properties
+    @property
+    def CLASSIFICATION_CACHE_SIZE(self) -> int:
+        return int(os.getenv('CLASSIFICATION_CACHE_SIZE', '2000'))
+
+    @property
+    def CLASSIFICATION_CACHE_TTL_SECONDS(self) -> int:
+        return int(os.getenv('CLASSIFICATION_CACHE_TTL_SECONDS', '3600'))
+
+    @property
+    def ENABLE_LOCAL_CLASSIFIER(self) -> bool:
+        return os.getenv('ENABLE_LOCAL_CLASSIFIER', 'true').lower() == 'true'
+
+    @property
+    def LOCAL_CLASSIFIER_CONFIDENCE(self) -> float:
+        return float(os.getenv('LOCAL_CLASSIFIER_CONFIDENCE', '0.9'))
+
+    # Response Cache Properties
+    @property
+    def ENABLE_RESPONSE_CACHE(self) -> bool:
+        return os.getenv('ENABLE_RESPONSE_CACHE', 'true').lower() == 'true'
+
+    @property
+    def RESPONSE_CACHE_SIZE(self) -> int:
+        return int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+
+    @property
+    def RESPONSE_CACHE_TTL_SECONDS(self) -> int:
+        return int(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '120'))
+
+    @property
+    def RESPONSE_CACHE_SIMILARITY(self) -> float:
+        return float(os.getenv('RESPONSE_CACHE_SIMILARITY', '0.92'))
+
+    @property
+    def RESPONSE_CACHE_TIMEOUT_SECONDS(self) -> float:
+        return float(os.getenv('RESPONSE_CACHE_TIMEOUT_SECONDS', '3'))
+
+    # Active Thread Properties
+    @property
+    def ACTIVE_THREADS_MAX(self) -> int:
+        return int(os.getenv('ACTIVE_THREADS_MAX', '5000'))
+
+    @property
+    def ACTIVE_THREADS_TTL_SECONDS(self) -> int:
+        return int(os.getenv('ACTIVE_THREADS_TTL_SECONDS', '86400'))
+
+    @property
+    def ACTIVE_THREADS_SNAPSHOT_PATH(self) -> str:
+        return os.getenv('ACTIVE_THREADS_SNAPSHOT_PATH', '')
+
+    @property
+    def ACTIVE_THREADS_SNAPSHOT_INTERVAL_SECONDS(self) -> int:
+        return int(os.getenv('ACTIVE_THREADS_SNAPSHOT_INTERVAL_SECONDS', '60'))
+
+    # Observability Properties
+    @property
+    def ENABLE_METRICS(self) -> bool:
+        return os.getenv('ENABLE_METRICS', 'true').lower() == 'true'
+
+    @property
+    def METRICS_PORT(self) -> int:
+        return int(os.getenv('METRICS_PORT', '9100'))
+
+    @property
+    def ENABLE_OTLP_EXPORT(self) -> bool:
+        return os.getenv('ENABLE_OTLP_EXPORT', 'false').lower() == 'true'
+
     # Langfuse Properties
     @property
     def ENABLE_LANGFUSE(self) -> bool:
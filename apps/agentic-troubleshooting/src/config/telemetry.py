@@ -1,13 +1,64 @@
-"""Telemetry configuration for Langfuse integration."""
+"""Telemetry configuration: Langfuse/OTLP tracing and Prometheus metrics."""
 
 import os
 import base64
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+from prometheus_client import Counter, Histogram, start_http_server
+from strands.hooks import AfterToolCallEvent, BeforeToolCallEvent, HookProvider, HookRegistry
 from strands.telemetry import StrandsTelemetry
 from src.config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+tracer = trace.get_tracer("k8s-troubleshooting-agent")
+
+STAGE_SECONDS = Histogram(
+    "agent_stage_duration_seconds",
+    "Time spent in each stage of the request pipeline",
+    ["stage", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+)
+TOOL_SECONDS = Histogram(
+    "agent_tool_duration_seconds",
+    "Time spent in individual tool calls",
+    ["agent", "tool", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40)
+)
+TOKENS = Counter(
+    "agent_tokens_total",
+    "Model tokens used per agent",
+    ["agent", "direction"]
+)
+TOOL_OUTPUT_BYTES = Counter(
+    "agent_tool_output_bytes_total",
+    "Bytes of tool output sent to the model",
+    ["tool"]
+)
+TOOL_OUTPUT_BYTES_SAVED = Counter(
+    "agent_tool_output_bytes_saved_total",
+    "Bytes removed from tool output by compact encoding and token budgets",
+    ["tool"]
+)
+TOOL_OUTPUT_TOKENS_SAVED = Counter(
+    "agent_tool_output_tokens_saved_total",
+    "Estimated model tokens saved by compact tool output",
+    ["tool"]
+)
+CACHE_REQUESTS = Counter(
+    "agent_cache_requests_total",
+    "Cache lookups by cache and outcome",
+    ["cache", "outcome"]
+)
+
+_metrics_server_lock = threading.Lock()
+_metrics_server_started = False
+
 
 def setup_langfuse_telemetry():
     """Configure and initialize Langfuse telemetry."""
@@ -38,3 +89,126 @@ def setup_langfuse_telemetry():
     logger.info("Langfuse telemetry initialized successfully")
     
     return telemetry
+
+
+
+def setup_otlp_telemetry():
+    """Export spans over OTLP to the collector named by the standard OTEL_* variables.
+    
+    Langfuse configures its own endpoint, so this only applies when it is off.
+    """
+    if Config.ENABLE_LANGFUSE or not Config.ENABLE_OTLP_EXPORT:
+        return None
+    
+    telemetry = StrandsTelemetry().setup_otlp_exporter()
+    logger.info("OTLP span export initialized")
+    return telemetry
+
+
+def start_metrics_server():
+    """Serve Prometheus metrics on /metrics, once per process."""
+    global _metrics_server_started
+    if not Config.ENABLE_METRICS:
+        logger.info("Prometheus metrics disabled")
+        return
+    
+    with _metrics_server_lock:
+        if _metrics_server_started:
+            return
+        start_http_server(Config.METRICS_PORT)
+        _metrics_server_started = True
+    logger.info(f"Prometheus metrics served on port {Config.METRICS_PORT}")
+
+
+@contextmanager
+def stage(name: str, **attributes):
+    """Time one pipeline stage as a span and a histogram observation.
+    
+    Exceptions that are part of normal control flow can set a metrics_outcome
+    class attribute (e.g. "silent") to be recorded under it instead of "error".
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    with tracer.start_as_current_span(f"stage.{name}", attributes=attributes,
+                                      record_exception=False, set_status_on_exception=False) as span:
+        try:
+            yield span
+        except Exception as e:
+            outcome = getattr(e, "metrics_outcome", "error")
+            if outcome == "error":
+                span.record_exception(e)
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            STAGE_SECONDS.labels(stage=name, outcome=outcome).observe(time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a cache lookup; hit rates are derived from the hit and miss series."""
+    CACHE_REQUESTS.labels(cache=cache, outcome="hit" if hit else "miss").inc()
+    trace.get_current_span().set_attribute(f"cache.{cache}.hit", hit)
+
+
+def record_tool_output(tool: str, raw_bytes: int, output_bytes: int):
+    """Count tool output size and what compact encoding saved (tokens estimated at 4 bytes each)."""
+    saved = max(raw_bytes - output_bytes, 0)
+    TOOL_OUTPUT_BYTES.labels(tool=tool).inc(output_bytes)
+    TOOL_OUTPUT_BYTES_SAVED.labels(tool=tool).inc(saved)
+    TOOL_OUTPUT_TOKENS_SAVED.labels(tool=tool).inc(saved // 4)
+
+
+def record_usage(agent_name: str, agent, result):
+    """Count the tokens an agent invocation used.
+    
+    Strands accumulates usage over the agent's lifetime, so the totals seen at
+    the previous invocation are kept in agent state and only the delta is counted.
+    """
+    try:
+        usage = result.metrics.accumulated_usage
+    except AttributeError:
+        return
+    
+    previous = agent.state.get("recorded_usage") or {}
+    delta: Dict[str, Any] = {}
+    for key, direction in (("inputTokens", "input"), ("outputTokens", "output")):
+        total = usage.get(key, 0)
+        count = total - previous.get(key, 0)
+        if count < 0:
+            count = total
+        delta[direction] = count
+        if count:
+            TOKENS.labels(agent=agent_name, direction=direction).inc(count)
+    agent.state.set("recorded_usage", {key: usage.get(key, 0) for key in ("inputTokens", "outputTokens")})
+    
+    span = trace.get_current_span()
+    span.set_attribute("tokens.input", delta["input"])
+    span.set_attribute("tokens.output", delta["output"])
+
+
+class ToolTimingHook(HookProvider):
+    """Records the duration and outcome of every tool call an agent makes."""
+    
+    def __init__(self, agent_name: str):
+        self.agent_name = agent_name
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def register_hooks(self, registry: HookRegistry, **kwargs):
+        registry.add_callback(BeforeToolCallEvent, self.before_tool_call)
+        registry.add_callback(AfterToolCallEvent, self.after_tool_call)
+    
+    def before_tool_call(self, event: BeforeToolCallEvent):
+        with self._lock:
+            self._started[event.tool_use["toolUseId"]] = time.perf_counter()
+    
+    def after_tool_call(self, event: AfterToolCallEvent):
+        with self._lock:
+            started: Optional[float] = self._started.pop(event.tool_use["toolUseId"], None)
+        if started is None:
+            return
+        
+        failed = getattr(event, "exception", None) or event.result.get("status") == "error"
+        outcome = "error" if failed else "ok"
+        TOOL_SECONDS.labels(
+            agent=self.agent_name, tool=event.tool_use["name"], outcome=outcome
+        ).observe(time.perf_counter() - started)
@@ -1,10 +1,10 @@
 """S3 Vectors client for dashboard operations."""
 
-import boto3
 import json
 import os
 from typing import List, Dict, Any, Tuple
 import logging
+from src.config.aws_clients import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +17,8 @@ class VectorClient:
         self.vector_index_name = os.getenv('VECTOR_INDEX_NAME', 'k8s-troubleshooting')
         
         # Initialize clients
-        self.s3vectors_client = boto3.client('s3vectors', region_name=self.aws_region)
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name=self.aws_region)
+        self.s3vectors_client = get_client('s3vectors', self.aws_region)
+        self.bedrock_client = get_client('bedrock-runtime', self.aws_region)
     
     def list_all_vectors(self) -> List[Dict[str, Any]]:
         """List all vectors in the database."""
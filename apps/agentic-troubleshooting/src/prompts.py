@@ -8,13 +8,13 @@ Message: "{message}"
 Respond with only "YES" or "NO"."""
 
 # Orchestrator Agent Prompt
-ORCHESTRATOR_SYSTEM_PROMPT = """You are a K8s troubleshooting orchestrator with A2A memory capabilities:
+ORCHESTRATOR_SYSTEM_PROMPT = """You are a K8s troubleshooting orchestrator with memory capabilities:
 
-1. Check memory first: Use memory_agent_provider to search for similar issues (A2A - discover agent and tools)
+1. Check memory first: Use search_memory to search for similar issues
 2. Return found solutions: If memory has solutions, return that content directly to user
 3. Troubleshoot new issues: If no memory found, use troubleshoot_k8s to solve
-4. Save valuable solutions: After successful troubleshooting, save with memory_agent_provider (A2A)
-5. Save knowledge sharing: If user shares solutions/tips (not questions), save directly to build tribal knowledge
+4. Save valuable solutions: After successful troubleshooting, save with save_to_memory
+5. Save knowledge sharing: If user shares solutions/tips (not questions), save directly with save_to_memory to build tribal knowledge
 6. Format for Slack: Use single * for bold, no markdown
 7. Always return solutions, never storage confirmations"""
 
@@ -34,4 +34,53 @@ K8S_KEYWORDS = [
     "kubernetes", "k8s", "deployment", "service", "troubleshoot",
     "namespace", "kubectl", "container", "restart", "crash",
     "debug", "logs", "status", "cluster", "node"
-]
\ No newline at end of file
+]
+
+# Seed examples for the local lexical classifier (text, should_respond)
+CLASSIFIER_TRAINING_EXAMPLES = [
+    ("my pod is stuck in CrashLoopBackOff", True),
+    ("checkout pods stuck pending", True),
+    ("why is the deployment not rolling out", True),
+    ("kubectl get pods shows ImagePullBackOff", True),
+    ("the service returns 503 after the deploy", True),
+    ("node is NotReady since this morning", True),
+    ("container keeps getting OOMKilled", True),
+    ("can someone help debug the api errors", True),
+    ("pods can't pull the image from ecr", True),
+    ("ingress is returning 502 bad gateway", True),
+    ("the job failed with exit code 137", True),
+    ("how do I check logs for the payment service", True),
+    ("readiness probe failing on the frontend", True),
+    ("pvc stuck in pending, no storage class", True),
+    ("hpa is not scaling the deployment", True),
+    ("getting connection refused from redis", True),
+    ("cluster autoscaler not adding nodes", True),
+    ("timeout errors talking to the database", True),
+    ("the app is down in production", True),
+    ("anyone seeing high latency on checkout", True),
+    ("rollout restart did not fix it", True),
+    ("configmap change is not picked up by the pods", True),
+    ("how do I fix a failing liveness probe", True),
+    ("evicted pods everywhere in the namespace", True),
+    ("thanks!", False),
+    ("thank you so much", False),
+    ("good morning everyone", False),
+    ("lunch anyone?", False),
+    ("happy friday", False),
+    ("lol", False),
+    ("sounds good", False),
+    ("see you tomorrow", False),
+    ("congrats on the launch", False),
+    ("who is joining the standup", False),
+    ("great job team", False),
+    ("ok", False),
+    ("nice", False),
+    ("let's sync after the meeting", False),
+    ("i'll be out of office next week", False),
+    ("welcome to the channel", False),
+    ("can you share the slides from the demo", False),
+    ("haha that's funny", False),
+    ("coffee break?", False),
+    ("have a great weekend", False),
+    ("meeting moved to 3pm", False),
+]
@@ -2,6 +2,7 @@
 
 import logging
 import asyncio
+from typing import Optional
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
 from slack_sdk import WebClient
@@ -9,30 +10,188 @@ from src.prompts import K8S_KEYWORDS
 
 
 from src.config.settings import Config
+from src.config.telemetry import stage
 from src.agents.agent_orchestrator import OrchestratorAgent, AgentSilentException
+from src.slack_stream import SlackStreamWriter
+from src.thread_context import ThreadContextCache
+from src.utils.debouncer import MessageDebouncer
+from src.utils.thread_registry import ActiveThreadRegistry
+from src.utils.ttl_cache import TTLCache
+from src.utils.worker_pool import KeyedWorkerPool
 
 logger = logging.getLogger(__name__)
 
 
-class SlackHandler:
-    """Handles Slack events and routes them to the K8s agent."""
+class SlackHandlerBase:
+    """State and helpers shared by the sync and async Slack front ends."""
     
     def __init__(self):
-        """Initialize Slack handler and K8s agent."""
+        """Initialize the K8s agent and per-thread bookkeeping."""
         # Validate configuration
         Config.validate()
         
+        # Initialize K8s orchestrator
+        self.orchestrator = OrchestratorAgent()
+        
+        # Remember recent event ids to drop Slack retries and duplicate deliveries
+        self.seen_events = TTLCache(
+            max_size=Config.EVENT_DEDUP_MAX_SIZE,
+            ttl_seconds=Config.EVENT_DEDUP_TTL_SECONDS
+        )
+        
+        # Cache thread history per session so only new replies are fetched
+        self.thread_context = ThreadContextCache(
+            max_threads=Config.MAX_SESSIONS,
+            ttl_seconds=Config.SESSION_TTL_SECONDS,
+            max_lines=Config.MAX_CONTEXT_MESSAGES
+        )
+        self.orchestrator.sessions.add_evict_listener(self.thread_context.evict)
+        
+        # Track threads where bot has responded
+        self.active_threads = ActiveThreadRegistry(
+            max_threads=Config.ACTIVE_THREADS_MAX,
+            ttl_seconds=Config.ACTIVE_THREADS_TTL_SECONDS,
+            snapshot_path=Config.ACTIVE_THREADS_SNAPSHOT_PATH or None,
+            snapshot_interval=Config.ACTIVE_THREADS_SNAPSHOT_INTERVAL_SECONDS
+        )
+    
+    def _skip_message(self, event, bot_user_id: str) -> bool:
+        """Check whether a message event should be ignored before any work is queued."""
+        text = event.get("text", "")
+        user = event.get("user", "")
+        channel = event.get("channel", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        bot_id = event.get("bot_id")
+        
+        logger.info(f"Message received - User: {user}, Bot ID: {bot_id}, Channel: {channel}")
+        
+        # Skip if message is from any bot (including this one)
+        if bot_id:
+            logger.info(f"Skipping message from bot: {bot_id}")
+            return True
+        
+        # Skip if message is from the bot itself (belt and suspenders)
+        if user and user == bot_user_id:
+            logger.info("Skipping bot's own message (by user ID)")
+            return True
+        
+        # Skip if no user (some bot messages don't have user field)
+        if not user:
+            logger.info("Skipping message with no user field")
+            return True
+        
+        # Check if bot is mentioned - if so, skip here as app_mention will handle it
+        is_mention = f"<@{bot_user_id}>" in text
+        if is_mention:
+            logger.info("Message contains mention - will be handled by app_mention event")
+            return True
+        
+        # Check if this is a reply in an active thread
+        is_active_thread = False
+        if thread_ts and thread_ts != event.get("ts"):
+            # This is a threaded message
+            thread_key = f"{channel}:{thread_ts}"
+            is_active_thread = thread_key in self.active_threads
+            if is_active_thread:
+                logger.info(f"Message is in active thread: {thread_key}")
+        
+        # Check if agent should respond (pass thread info to avoid unnecessary classification)
+        # should_respond = self.should_respond(text, is_mention, is_active_thread) or is_active_thread
+        # logger.info(f"Agent should respond: {should_respond} for message: '{text[:50]}...' (active_thread: {is_active_thread})")
+        # if not should_respond:
+        #     logger.info("Agent decided not to respond to this message")
+        #     return True
+        
+        return False
+    
+    def _debounce_key(self, event) -> str:
+        """Key under which a user's quick follow-up messages are merged."""
+        channel = event.get("channel", "")
+        user = event.get("user", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        if thread_ts != event.get("ts"):
+            return f"{channel}:{thread_ts}:{user}"
+        return f"{channel}:{user}"
+    
+    def _merge_events(self, events: list) -> dict:
+        """Combine a burst of message events into one, replying to the first message."""
+        event = events[0]
+        if len(events) > 1:
+            event = dict(event)
+            event["text"] = "\n".join(item.get("text", "") for item in events)
+        return event
+    
+    def _is_duplicate(self, body, event) -> bool:
+        """Record an event and report whether it has already been received.
+        
+        Retries keep their event_id, and the same message can be redelivered with
+        a new event_id but the same client_msg_id, so both are checked. Keys are
+        scoped by event type because a mention arrives as both a message and an
+        app_mention event.
+        """
+        event_type = event.get("type", "")
+        keys = []
+        if body.get("event_id"):
+            keys.append(f"event:{body['event_id']}")
+        if event.get("client_msg_id"):
+            keys.append(f"{event_type}:{event['client_msg_id']}")
+        
+        # Evaluate every key so all of them are recorded
+        is_new = [self.seen_events.add(key) for key in keys]
+        if keys and not all(is_new):
+            logger.info(f"Skipping duplicate {event_type} event: {', '.join(keys)}")
+            return True
+        return False
+    
+    def should_respond(self, message: str, is_mention: bool = False, is_thread: bool = False) -> bool:
+        """Check if should respond to message using Nova Micro or keyword fallback."""
+        if is_mention:
+            return True
+        
+        if is_thread:
+            return True
+        
+        return any(keyword in message.lower() for keyword in K8S_KEYWORDS)
+    
+    def _response_text(self, agent_response) -> str:
+        """Extract the reply text from an agent result."""
+        if hasattr(agent_response, 'content'):
+            response = str(agent_response.content).strip()
+        elif hasattr(agent_response, 'text'):
+            response = str(agent_response.text).strip()
+        elif isinstance(agent_response, (list, tuple)):
+            response = ' '.join(str(part) for part in agent_response).strip()
+        else:
+            response = str(agent_response).strip()
+        
+        return response if response else "I'm here to help with Kubernetes troubleshooting. How can I assist you?"
+
+
+class SlackHandler(SlackHandlerBase):
+    """Handles Slack events and routes them to the K8s agent."""
+    
+    def __init__(self):
+        """Initialize Slack handler and K8s agent."""
+        super().__init__()
+        
         # Initialize Slack app
         self.app = App(
             token=Config.SLACK_BOT_TOKEN,
             signing_secret=Config.SLACK_SIGNING_SECRET
         )
         
-        # Initialize K8s orchestrator
-        self.orchestrator = OrchestratorAgent()
+        # Process events off the Bolt listener thread, one at a time per Slack thread
+        self.workers = KeyedWorkerPool(
+            max_workers=Config.WORKER_POOL_SIZE,
+            max_pending=Config.MAX_PENDING_EVENTS,
+            name="slack-worker"
+        )
         
-        # Track threads where bot has responded
-        self.active_threads = set()
+        # Merge quick follow-up messages from the same user into one request
+        self.debouncer = MessageDebouncer(
+            delay_seconds=Config.RESPONSE_DELAY_SECONDS,
+            flush=self._dispatch_messages
+        )
         
         # Register event handlers
         self._register_handlers()
@@ -45,7 +204,7 @@ class SlackHandler:
         
         # Handle messages (excluding bot messages)
         @self.app.event("message")
-        def handle_message(event, say, client: WebClient):
+        def handle_message(body, event, say, client: WebClient):
             """Handle incoming messages."""
             try:
                 # Skip if this is a message_changed or message_deleted event
@@ -54,108 +213,32 @@ class SlackHandler:
                     logger.info(f"Skipping message with subtype: {subtype}")
                     return
                 
-                text = event.get("text", "")
-                user = event.get("user", "")
-                channel = event.get("channel", "")
-                thread_ts = event.get("thread_ts", event.get("ts"))
-                bot_id = event.get("bot_id")
-                
-                logger.info(f"Message received - User: {user}, Bot ID: {bot_id}, Channel: {channel}")
-                
-                # Skip if message is from any bot (including this one)
-                if bot_id:
-                    logger.info(f"Skipping message from bot: {bot_id}")
+                # Skip Slack retries and duplicate deliveries
+                if self._is_duplicate(body, event):
                     return
                 
-                # Skip if message is from the bot itself (belt and suspenders)
-                if user and user == bot_user_id:
-                    logger.info("Skipping bot's own message (by user ID)")
+                if self._skip_message(event, bot_user_id):
                     return
                 
-                # Skip if no user (some bot messages don't have user field)
-                if not user:
-                    logger.info("Skipping message with no user field")
-                    return
-                
-                # Check if bot is mentioned - if so, skip here as app_mention will handle it
-                is_mention = f"<@{bot_user_id}>" in text
-                if is_mention:
-                    logger.info("Message contains mention - will be handled by app_mention event")
-                    return
-                
-                # Check if this is a reply in an active thread
-                is_active_thread = False
-                if thread_ts and thread_ts != event.get("ts"):
-                    # This is a threaded message
-                    thread_key = f"{channel}:{thread_ts}"
-                    is_active_thread = thread_key in self.active_threads
-                    if is_active_thread:
-                        logger.info(f"Message is in active thread: {thread_key}")
-                
-                # Check if agent should respond (pass thread info to avoid unnecessary classification)
-                # should_respond = self.should_respond(text, is_mention, is_active_thread) or is_active_thread
-                # logger.info(f"Agent should respond: {should_respond} for message: '{text[:50]}...' (active_thread: {is_active_thread})")
-                # if not should_respond:
-                #     logger.info("Agent decided not to respond to this message")
-                #     return
-                
-                # Get thread context if enabled
-                context = None
-                if Config.ENABLE_THREAD_CONTEXT and thread_ts != event.get("ts"):
-                    try:
-                        result = client.conversations_replies(
-                            channel=channel,
-                            ts=thread_ts,
-                            limit=Config.MAX_CONTEXT_MESSAGES
-                        )
-                        messages = result.get("messages", [])
-                        context = "\n".join([
-                            f"{msg.get('user', 'User')}: {msg.get('text', '')}"
-                            for msg in messages[:-1]  # Exclude current message
-                        ])
-                    except Exception as e:
-                        logger.error(f"Error getting thread context: {e}")
-                
-                # Add delay to avoid appearing too eager
-                if Config.RESPONSE_DELAY_SECONDS > 0:
-                    asyncio.run(asyncio.sleep(Config.RESPONSE_DELAY_SECONDS))
-                
-                # Get response from agent with thread_id for memory
-                thread_key = f"{channel}:{thread_ts}"
-                logger.info("Generating response from agent...")
-                response = self.respond(text, thread_key, context)
-                
-                # Didnt pass the callback validation mechanism
-                if not response:
-                    return None
-                
-                logger.info(f"Agent response generated: {len(response)} characters")
-                
-                # Send response in thread
-                logger.info(f"Sending response to thread: {thread_ts}")
-                say(
-                    text=response,
-                    thread_ts=thread_ts
-                )
-                logger.info("Response sent successfully")
-                
-                # Mark this thread as active
-                thread_key = f"{channel}:{thread_ts}"
-                self.active_threads.add(thread_key)
-                logger.info(f"Added thread to active threads: {thread_key}")
+                # Wait for the user to finish typing, then hand off to the worker pool
+                self.debouncer.add(self._debounce_key(event), (event, say, client))
                 
             except Exception as e:
                 logger.error(f"Error handling message: {e}")
                 say(
                     text="Sorry, I encountered an error processing your message.",
-                    thread_ts=thread_ts
+                    thread_ts=event.get("thread_ts", event.get("ts"))
                 )
         
         # Handle app mentions
         @self.app.event("app_mention")
-        def handle_mention(event, say):
+        def handle_mention(body, event, say, client: WebClient):
             """Handle direct mentions."""
             try:
+                # Skip Slack retries and duplicate deliveries
+                if self._is_duplicate(body, event):
+                    return
+                
                 text = event.get("text", "")
                 user = event.get("user", "")
                 thread_ts = event.get("thread_ts", event.get("ts"))
@@ -167,41 +250,148 @@ class SlackHandler:
                     logger.info("Skipping bot's own mention")
                     return
                 
-                # Remove mention from text
-                text = text.replace(f"<@{bot_user_id}>", "").strip()
-                
-                # Get response from agent with thread_id for memory
+                # Hand off to the worker pool so the event is acked immediately
                 channel = event.get("channel", "")
                 thread_key = f"{channel}:{thread_ts}"
-                logger.info("Generating response for mention...")
-                response = self.respond(text, thread_key)
-                logger.info(f"Mention response generated: {len(response)} characters")
+                if not self.workers.submit(thread_key, self._process_mention, event, say, client, bot_user_id):
+                    say(
+                        text="I'm handling a lot of requests right now. Please try again in a moment.",
+                        thread_ts=thread_ts
+                    )
                 
-                # Ensure response is not empty
-                if not response or not response.strip():
-                    logger.warning("Empty response detected, using fallback")
-                    response = "I'm here to help with Kubernetes troubleshooting. How can I assist you?"
-                
-                # Send response in thread
-                logger.info(f"Sending mention response to thread: {thread_ts}")
+            except Exception as e:
+                logger.error(f"Error handling mention: {e}")
                 say(
-                    text=response,
+                    text="Sorry, I encountered an error processing your request.",
                     thread_ts=thread_ts
                 )
-                logger.info("Mention response sent successfully")
+    
+    def _dispatch_messages(self, debounce_key: str, pending: list):
+        """Merge a burst of messages and queue a single response for it."""
+        event = self._merge_events([item[0] for item in pending])
+        _, say, client = pending[-1]
+        
+        channel = event.get("channel", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        thread_key = f"{channel}:{thread_ts}"
+        if not self.workers.submit(thread_key, self._process_message, event, say, client):
+            # Passive messages may not even be K8s related, so drop them quietly
+            logger.warning(f"Dropping message for {thread_key}: worker pool is full")
+    
+    def _process_message(self, event, say, client: WebClient):
+        """Generate and send a response for a channel or thread message."""
+        text = event.get("text", "")
+        channel = event.get("channel", "")
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        
+        try:
+            context = self._thread_context(client, event)
+            
+            # Get response from agent with thread_id for memory
+            thread_key = f"{channel}:{thread_ts}"
+            if Config.ENABLE_STREAMING:
+                logger.info("Streaming response from agent...")
+                response = self.respond_streaming(text, thread_key, client, channel, thread_ts, context)
                 
-                # Mark this thread as active
-                channel = event.get("channel", "")
-                thread_key = f"{channel}:{thread_ts}"
-                self.active_threads.add(thread_key)
-                logger.info(f"Added thread to active threads: {thread_key}")
+                # Didnt pass the callback validation mechanism
+                if not response:
+                    return None
                 
-            except Exception as e:
-                logger.error(f"Error handling mention: {e}")
+                logger.info(f"Streamed response sent: {len(response)} characters")
+            else:
+                logger.info("Generating response from agent...")
+                response = self.respond(text, thread_key, context)
+                
+                # Didnt pass the callback validation mechanism
+                if not response:
+                    return None
+                
+                logger.info(f"Agent response generated: {len(response)} characters")
+                
+                # Send response in thread
+                logger.info(f"Sending response to thread: {thread_ts}")
+                with stage("slack_post"):
+                    say(
+                        text=response,
+                        thread_ts=thread_ts
+                    )
+                logger.info("Response sent successfully")
+            
+            # Mark this thread as active
+            self.active_threads.add(thread_key)
+            logger.info(f"Added thread to active threads: {thread_key}")
+            
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            say(
+                text="Sorry, I encountered an error processing your message.",
+                thread_ts=thread_ts
+            )
+    
+    def _process_mention(self, event, say, client: WebClient, bot_user_id: str):
+        """Generate and send a response for a direct mention."""
+        thread_ts = event.get("thread_ts", event.get("ts"))
+        
+        try:
+            # Remove mention from text
+            text = event.get("text", "").replace(f"<@{bot_user_id}>", "").strip()
+            
+            context = self._thread_context(client, event)
+            
+            # Get response from agent with thread_id for memory
+            channel = event.get("channel", "")
+            thread_key = f"{channel}:{thread_ts}"
+            if Config.ENABLE_STREAMING:
+                logger.info("Streaming response for mention...")
+                response = self.respond_streaming(text, thread_key, client, channel, thread_ts, context)
+            else:
+                logger.info("Generating response for mention...")
+                response = self.respond(text, thread_key, context)
+            
+            # Ensure response is not empty (a streamed response has already been posted)
+            if not response or not response.strip():
+                logger.warning("Empty response detected, using fallback")
                 say(
-                    text="Sorry, I encountered an error processing your request.",
+                    text="I'm here to help with Kubernetes troubleshooting. How can I assist you?",
                     thread_ts=thread_ts
                 )
+            elif not Config.ENABLE_STREAMING:
+                logger.info(f"Mention response generated: {len(response)} characters")
+                
+                # Send response in thread
+                logger.info(f"Sending mention response to thread: {thread_ts}")
+                with stage("slack_post"):
+                    say(
+                        text=response,
+                        thread_ts=thread_ts
+                    )
+            logger.info("Mention response sent successfully")
+            
+            # Mark this thread as active
+            self.active_threads.add(thread_key)
+            logger.info(f"Added thread to active threads: {thread_key}")
+            
+        except Exception as e:
+            logger.error(f"Error processing mention: {e}")
+            say(
+                text="Sorry, I encountered an error processing your request.",
+                thread_ts=thread_ts
+            )
+    
+    def _thread_context(self, client: WebClient, event) -> Optional[str]:
+        """Get earlier messages of the event's thread if thread context is enabled."""
+        thread_ts = event.get("thread_ts")
+        if not Config.ENABLE_THREAD_CONTEXT or not thread_ts or thread_ts == event.get("ts"):
+            return None
+        
+        try:
+            with stage("slack_context"):
+                return self.thread_context.get_context(
+                    client, event.get("channel", ""), thread_ts, event.get("ts")
+                )
+        except Exception as e:
+            logger.error(f"Error getting thread context: {e}")
+            return None
     
     def start(self):
         """Start the Slack handler."""
@@ -213,38 +403,52 @@ class SlackHandler:
         except Exception as e:
             logger.error(f"Error starting Slack handler: {e}")
             raise
+        finally:
+            self.active_threads.snapshot()
     
-    def should_respond(self, message: str, is_mention: bool = False, is_thread: bool = False) -> bool:
-        """Check if should respond to message using Nova Micro or keyword fallback."""
-        if is_mention:
-            return True
-        
-        if is_thread:
-            return True
-        
-        return any(keyword in message.lower() for keyword in K8S_KEYWORDS)
-
     def respond(self, message: str, thread_id: str, context: str = None) -> str:
         """Main entry point for responses."""
         try:
-            self.orchestrator.last_user_message = message
-            agent_response = self.orchestrator.agent(message)
-            
-            if hasattr(agent_response, 'content'):
-                response = str(agent_response.content).strip()
-            elif hasattr(agent_response, 'text'):
-                response = str(agent_response.text).strip()
-            elif isinstance(agent_response, (list, tuple)):
-                response = ' '.join(str(part) for part in agent_response).strip()
-            else:
-                response = str(agent_response).strip()
-            
-            return response if response else "I'm here to help with Kubernetes troubleshooting. How can I assist you?"
+            with stage("orchestrator"):
+                agent_response = self.orchestrator.invoke(message, thread_id, context)
+            return self._response_text(agent_response)
         except AgentSilentException:
             return None  # Return None to indicate no response should be sent
         except Exception as e:
             logger.error(f"Orchestrator error: {e}")
             return "Error processing request. Please try again."
+    
+    def respond_streaming(self, message: str, thread_id: str, client: WebClient,
+                          channel: str, thread_ts: str, context: str = None) -> Optional[str]:
+        """Stream the response into a placeholder message that is edited as text arrives."""
+        writer = SlackStreamWriter(client, channel, thread_ts, Config.STREAM_UPDATE_INTERVAL_SECONDS)
+        
+        async def consume():
+            result = None
+            async for event in self.orchestrator.stream(message, thread_id, context):
+                if "data" in event:
+                    writer.append(event["data"])
+                elif "result" in event:
+                    result = event["result"]
+                else:
+                    writer.start()
+            return result
+        
+        try:
+            with stage("orchestrator"):
+                result = asyncio.run(consume())
+            response = self._response_text(result)
+        except AgentSilentException:
+            writer.discard()
+            return None  # Return None to indicate no response should be sent
+        except Exception as e:
+            logger.error(f"Orchestrator error: {e}")
+            response = "Error processing request. Please try again."
+        
+        with stage("slack_post"):
+            writer.finish(response)
+        return response
+    
         
 if __name__ == "__main__":
     # Configure logging
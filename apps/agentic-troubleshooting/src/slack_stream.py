@@ -0,0 +1,154 @@
+"""Progressive Slack message updates for streamed agent output."""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from slack_sdk import WebClient
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web.async_client import AsyncWebClient
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_TEXT = "_Looking into it..._"
+TYPING_SUFFIX = " ..."
+
+
+class SlackStreamWriter:
+    """Posts a placeholder reply and edits it as agent text streams in.
+    
+    Edits are throttled to one per update_interval seconds, and a 429 from
+    chat.update pushes the next edit out by the Retry-After delay.
+    """
+    
+    def __init__(self, client: WebClient, channel: str, thread_ts: str, update_interval: float):
+        self.client = client
+        self.channel = channel
+        self.thread_ts = thread_ts
+        self.update_interval = update_interval
+        self.message_ts: Optional[str] = None
+        self.buffer = ""
+        self._next_update = 0.0
+    
+    def start(self):
+        """Post the placeholder message if it hasn't been posted yet."""
+        if self.message_ts:
+            return
+        result = self.client.chat_postMessage(
+            channel=self.channel,
+            thread_ts=self.thread_ts,
+            text=PLACEHOLDER_TEXT
+        )
+        self.message_ts = result["ts"]
+        self._next_update = time.monotonic() + self.update_interval
+    
+    def append(self, text: str):
+        """Add streamed text and push an update if the throttle allows it."""
+        self.start()
+        self.buffer += text
+        if self.buffer.strip() and time.monotonic() >= self._next_update:
+            self._update(self.buffer + TYPING_SUFFIX)
+    
+    def finish(self, text: str):
+        """Replace the placeholder with the final response."""
+        if not self.message_ts:
+            self.client.chat_postMessage(channel=self.channel, thread_ts=self.thread_ts, text=text)
+            return
+        
+        # The final edit must land, so wait out any rate limit instead of skipping it
+        for _ in range(3):
+            delay = self._next_update - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if self._update(text):
+                return
+        self.client.chat_postMessage(channel=self.channel, thread_ts=self.thread_ts, text=text)
+    
+    def discard(self):
+        """Delete the placeholder when the agent decides not to respond."""
+        if not self.message_ts:
+            return
+        try:
+            self.client.chat_delete(channel=self.channel, ts=self.message_ts)
+        except SlackApiError as e:
+            logger.warning(f"Failed to delete placeholder message: {e}")
+        self.message_ts = None
+    
+    def _update(self, text: str) -> bool:
+        try:
+            self.client.chat_update(channel=self.channel, ts=self.message_ts, text=text)
+            self._next_update = time.monotonic() + self.update_interval
+            return True
+        except SlackApiError as e:
+            if e.response.status_code == 429:
+                retry_after = float(e.response.headers.get("Retry-After", self.update_interval))
+                logger.warning(f"chat.update rate limited, retrying in {retry_after}s")
+                self._next_update = time.monotonic() + retry_after
+            else:
+                logger.error(f"Failed to update streamed message: {e}")
+            return False
+
+
+class AsyncSlackStreamWriter(SlackStreamWriter):
+    """SlackStreamWriter for AsyncWebClient, used by the AsyncApp front end."""
+    
+    def __init__(self, client: AsyncWebClient, channel: str, thread_ts: str, update_interval: float):
+        super().__init__(client, channel, thread_ts, update_interval)
+    
+    async def start(self):
+        """Post the placeholder message if it hasn't been posted yet."""
+        if self.message_ts:
+            return
+        result = await self.client.chat_postMessage(
+            channel=self.channel,
+            thread_ts=self.thread_ts,
+            text=PLACEHOLDER_TEXT
+        )
+        self.message_ts = result["ts"]
+        self._next_update = time.monotonic() + self.update_interval
+    
+    async def append(self, text: str):
+        """Add streamed text and push an update if the throttle allows it."""
+        await self.start()
+        self.buffer += text
+        if self.buffer.strip() and time.monotonic() >= self._next_update:
+            await self._update(self.buffer + TYPING_SUFFIX)
+    
+    async def finish(self, text: str):
+        """Replace the placeholder with the final response."""
+        if not self.message_ts:
+            await self.client.chat_postMessage(channel=self.channel, thread_ts=self.thread_ts, text=text)
+            return
+        
+        # The final edit must land, so wait out any rate limit instead of skipping it
+        for _ in range(3):
+            delay = self._next_update - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if await self._update(text):
+                return
+        await self.client.chat_postMessage(channel=self.channel, thread_ts=self.thread_ts, text=text)
+    
+    async def discard(self):
+        """Delete the placeholder when the agent decides not to respond."""
+        if not self.message_ts:
+            return
+        try:
+            await self.client.chat_delete(channel=self.channel, ts=self.message_ts)
+        except SlackApiError as e:
+            logger.warning(f"Failed to delete placeholder message: {e}")
+        self.message_ts = None
+    
+    async def _update(self, text: str) -> bool:
+        try:
+            await self.client.chat_update(channel=self.channel, ts=self.message_ts, text=text)
+            self._next_update = time.monotonic() + self.update_interval
+            return True
+        except SlackApiError as e:
+            if e.response.status_code == 429:
+                retry_after = float(e.response.headers.get("Retry-After", self.update_interval))
+                logger.warning(f"chat.update rate limited, retrying in {retry_after}s")
+                self._next_update = time.monotonic() + retry_after
+            else:
+                logger.error(f"Failed to update streamed message: {e}")
+            return False
@@ -0,0 +1,100 @@
+"""Incremental, cached Slack thread context."""
+
+import logging
+import threading
+from collections import deque
+from typing import Optional
+from slack_sdk import WebClient
+from slack_sdk.web.async_client import AsyncWebClient
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Slack recommends no more than 200 messages per conversations.replies page
+PAGE_SIZE = 200
+
+
+class _ThreadContext:
+    """Formatted lines of one thread and the newest ts already fetched."""
+    
+    def __init__(self, max_lines: int):
+        self.lines = deque(maxlen=max_lines)
+        self.last_ts: Optional[str] = None
+        self.lock = threading.Lock()
+
+
+class ThreadContextCache:
+    """Keeps a bounded ring of recent messages per thread.
+    
+    The first lookup for a thread reads its replies once; later lookups only ask
+    Slack for replies newer than the last seen ts via the oldest parameter.
+    """
+    
+    def __init__(self, max_threads: int, ttl_seconds: float, max_lines: int):
+        self.max_lines = max_lines
+        self.threads = TTLCache(max_size=max_threads, ttl_seconds=ttl_seconds)
+    
+    def get_context(self, client: WebClient, channel: str, thread_ts: str, current_ts: str) -> Optional[str]:
+        """Return the thread's messages before current_ts, fetching only new replies."""
+        entry = self._entry(channel, thread_ts)
+        
+        with entry.lock:
+            cursor = None
+            while True:
+                result = client.conversations_replies(**self._params(entry, channel, thread_ts, cursor))
+                cursor = self._merge(entry, result)
+                if not cursor:
+                    break
+            return self._render(entry, current_ts)
+    
+    async def aget_context(self, client: AsyncWebClient, channel: str, thread_ts: str,
+                           current_ts: str) -> Optional[str]:
+        """Async variant of get_context for the AsyncApp front end.
+        
+        Callers must serialize lookups per thread, as the async handler does.
+        """
+        entry = self._entry(channel, thread_ts)
+        
+        cursor = None
+        while True:
+            result = await client.conversations_replies(**self._params(entry, channel, thread_ts, cursor))
+            cursor = self._merge(entry, result)
+            if not cursor:
+                break
+        return self._render(entry, current_ts)
+    
+    def evict(self, key: str):
+        """Forget a thread, e.g. when its conversation session ends."""
+        self.threads.pop(key)
+    
+    def _entry(self, channel: str, thread_ts: str) -> _ThreadContext:
+        key = f"{channel}:{thread_ts}"
+        entry = self.threads.get_or_create(key, lambda: _ThreadContext(self.max_lines))
+        self.threads.touch(key)
+        return entry
+    
+    def _params(self, entry: _ThreadContext, channel: str, thread_ts: str, cursor: Optional[str]) -> dict:
+        params = {"channel": channel, "ts": thread_ts, "limit": PAGE_SIZE}
+        if entry.last_ts:
+            params["oldest"] = entry.last_ts
+        if cursor:
+            params["cursor"] = cursor
+        return params
+    
+    def _merge(self, entry: _ThreadContext, result) -> Optional[str]:
+        """Append unseen replies and return the cursor of the next page, if any."""
+        for msg in result.get("messages", []):
+            ts = msg.get("ts")
+            # The parent message is returned on every call, skip anything already seen
+            if not ts or (entry.last_ts and float(ts) <= float(entry.last_ts)):
+                continue
+            entry.lines.append((ts, f"{msg.get('user', 'User')}: {msg.get('text', '')}"))
+            entry.last_ts = ts
+        
+        if not result.get("has_more"):
+            return None
+        return result.get("response_metadata", {}).get("next_cursor") or None
+    
+    def _render(self, entry: _ThreadContext, current_ts: str) -> Optional[str]:
+        lines = [line for ts, line in entry.lines if float(ts) < float(current_ts)]
+        return "\n".join(lines) if lines else None
@@ -0,0 +1,376 @@
+"""Watch-based in-memory cache of pods, events, nodes and deployments.
+
+Each resource type is kept by a ResourceInformer: a background thread that
+lists once (paged), then watches from the list's resourceVersion, resuming
+from the last version it saw and relisting when the server answers 410 Gone.
+Objects are reduced to small dicts on arrival, so managedFields, specs and
+annotations never stay in memory. Events are capped by count and age; pods,
+nodes and deployments are kept in full, so their footprint is the number of
+objects in the cluster times the size of these compact records (well under
+1 KB per pod).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from kubernetes import client, watch
+from kubernetes.client.rest import ApiException
+from src.config.settings import Config
+from src.tools.event_index import EventIndex
+from src.tools.health_snapshot import ClusterHealth
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 500
+
+
+def _epoch(timestamp: Optional[datetime]) -> Optional[float]:
+    return timestamp.timestamp() if timestamp else None
+
+
+def pod_record(pod) -> Dict[str, Any]:
+    """Compact view of a V1Pod with what the troubleshooting tools need."""
+    containers = []
+    for cs in pod.status.container_statuses or []:
+        state, reason, exit_code, message = "Unknown", None, None, None
+        if cs.state and cs.state.running:
+            state = "Running"
+        elif cs.state and cs.state.waiting:
+            state, reason, message = "Waiting", cs.state.waiting.reason, cs.state.waiting.message
+        elif cs.state and cs.state.terminated:
+            terminated = cs.state.terminated
+            state, reason, exit_code, message = "Terminated", terminated.reason, terminated.exit_code, terminated.message
+
+        last = cs.last_state.terminated if cs.last_state else None
+        containers.append({
+            "name": cs.name,
+            "ready": bool(cs.ready),
+            "restarts": cs.restart_count or 0,
+            "state": state,
+            "reason": reason,
+            "exit_code": exit_code,
+            "message": message,
+            "last_reason": last.reason if last else None,
+            "last_exit_code": last.exit_code if last else None
+        })
+
+    # The controlling owner (e.g. ReplicaSet/checkout-7d9f8b6c5) links pods to deployments
+    owner = next((ref for ref in pod.metadata.owner_references or [] if ref.controller), None)
+    
+    # Only failing conditions are kept, they explain Pending and NotReady pods
+    conditions = [
+        {"type": c.type, "reason": c.reason, "message": c.message}
+        for c in pod.status.conditions or []
+        if c.status != "True"
+    ]
+
+    return {
+        "namespace": pod.metadata.namespace,
+        "name": pod.metadata.name,
+        "labels": dict(pod.metadata.labels or {}),
+        "node": pod.spec.node_name,
+        "phase": pod.status.phase,
+        "ip": pod.status.pod_ip,
+        "status_reason": pod.status.reason,
+        "owner": f"{owner.kind}/{owner.name}" if owner else None,
+        "containers": containers,
+        "conditions": conditions,
+        "created": _epoch(pod.metadata.creation_timestamp)
+    }
+
+
+def event_record(event) -> Dict[str, Any]:
+    """Compact view of a CoreV1Event."""
+    involved = event.involved_object
+    last_seen = event.last_timestamp or event.event_time or event.metadata.creation_timestamp
+    return {
+        "namespace": event.metadata.namespace,
+        "name": event.metadata.name,
+        "kind": involved.kind if involved else None,
+        "object": involved.name if involved else None,
+        "type": event.type,
+        "reason": event.reason,
+        "message": event.message,
+        "count": event.count or 1,
+        "last_seen": _epoch(last_seen)
+    }
+
+
+def node_record(node) -> Dict[str, Any]:
+    """Compact view of a V1Node: readiness and any pressure conditions."""
+    ready = False
+    problems = []
+    for condition in node.status.conditions or []:
+        if condition.type == "Ready":
+            ready = condition.status == "True"
+        elif condition.status == "True":
+            problems.append(condition.type)
+    return {
+        "name": node.metadata.name,
+        "ready": ready,
+        "unschedulable": bool(node.spec.unschedulable),
+        "problems": problems
+    }
+
+
+def deployment_record(deployment) -> Dict[str, Any]:
+    """Compact view of a V1Deployment's rollout state."""
+    status = deployment.status
+    return {
+        "namespace": deployment.metadata.namespace,
+        "name": deployment.metadata.name,
+        "replicas": deployment.spec.replicas or 0,
+        "ready": status.ready_replicas or 0,
+        "updated": status.updated_replicas or 0,
+        "available": status.available_replicas or 0
+    }
+
+
+def _namespaced_key(record: Dict[str, Any]) -> Hashable:
+    return (record["namespace"], record["name"])
+
+
+class ResourceInformer:
+    """Keeps one resource type in memory via list-then-watch.
+    
+    Listeners get reset(records) after every list and apply(event_type, record)
+    for every watch event, so derived views stay in step without their own
+    watches. With store=False the informer keeps no objects itself and only
+    feeds its listeners.
+    """
+
+    def __init__(self, name: str, list_fn: Callable, transform: Callable[[Any], Dict[str, Any]],
+                 key_fn: Callable[[Dict[str, Any]], Hashable] = _namespaced_key,
+                 max_items: Optional[int] = None, watch_timeout: int = 300, store: bool = True):
+        self.name = name
+        self.list_fn = list_fn
+        self.transform = transform
+        self.key_fn = key_fn
+        self.max_items = max_items
+        self.watch_timeout = watch_timeout
+        self.store = store
+        self._listeners: List[Any] = []
+        self.resource_version: Optional[str] = None
+        self.synced = threading.Event()
+        self._items: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._last_sync = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener):
+        """Register an object with reset(records) and apply(event_type, record) methods."""
+        self._listeners.append(listener)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"informer-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._items.get(key)
+
+    def values(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._items.values())
+
+    def staleness(self) -> float:
+        """Seconds since the cache last heard from the API server."""
+        return time.monotonic() - self._last_sync if self._last_sync else float("inf")
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _run(self):
+        backoff = 1
+        while not self._stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch()
+                backoff = 1
+            except ApiException as e:
+                if e.status == 410:
+                    logger.info(f"{self.name} informer: resourceVersion expired, relisting")
+                    self.resource_version = None
+                    continue
+                logger.warning(f"{self.name} informer API error: {e.status} {e.reason}")
+            except Exception as e:
+                logger.warning(f"{self.name} informer error: {e}")
+
+            self._stopped.wait(backoff)
+            backoff = min(backoff * 2, 60)
+
+    def _relist(self):
+        items: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        kwargs = {"limit": PAGE_SIZE}
+        while True:
+            response = self.list_fn(**kwargs)
+            for obj in response.items:
+                record = self.transform(obj)
+                items[self.key_fn(record)] = record
+            if not response.metadata._continue:
+                break
+            kwargs["_continue"] = response.metadata._continue
+
+        if self.store:
+            with self._lock:
+                self._items = items
+                self._shrink_locked()
+        for listener in self._listeners:
+            listener.reset(list(items.values()))
+        self.resource_version = response.metadata.resource_version
+        self._last_sync = time.monotonic()
+        self.synced.set()
+        logger.info(f"{self.name} informer listed {len(items)} objects at resourceVersion {self.resource_version}")
+
+    def _watch(self):
+        stream = watch.Watch().stream(
+            self.list_fn,
+            resource_version=self.resource_version,
+            timeout_seconds=self.watch_timeout,
+            allow_watch_bookmarks=True
+        )
+        for event in stream:
+            if self._stopped.is_set():
+                return
+
+            event_type = event["type"]
+            raw = event.get("raw_object") or {}
+            if event_type == "ERROR":
+                raise ApiException(status=raw.get("code"), reason=raw.get("reason"))
+
+            self.resource_version = raw.get("metadata", {}).get("resourceVersion", self.resource_version)
+            self._last_sync = time.monotonic()
+            if event_type == "BOOKMARK":
+                continue
+
+            record = self.transform(event["object"])
+            if self.store:
+                self._store(event_type, record)
+            for listener in self._listeners:
+                listener.apply(event_type, record)
+
+        # A watch that times out cleanly still confirms the cache is current
+        self._last_sync = time.monotonic()
+
+    def _store(self, event_type: str, record: Dict[str, Any]):
+        key = self.key_fn(record)
+        with self._lock:
+            self._items.pop(key, None)
+            if event_type != "DELETED":
+                self._items[key] = record
+                self._shrink_locked()
+
+    def _shrink_locked(self):
+        if self.max_items is None:
+            return
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+
+class ClusterCache:
+    """Informers for the resources the troubleshooting tools read."""
+
+    def __init__(self, max_events: int, max_event_age: float, watch_timeout: int):
+        core = client.CoreV1Api()
+        apps = client.AppsV1Api()
+        self.pods = ResourceInformer("pods", core.list_pod_for_all_namespaces, pod_record,
+                                     watch_timeout=watch_timeout)
+        
+        # Events live only in the time-ordered index
+        self.event_index = EventIndex(max_events=max_events, max_age_seconds=max_event_age)
+        self.events = ResourceInformer("events", core.list_event_for_all_namespaces, event_record,
+                                       watch_timeout=watch_timeout, store=False)
+        self.events.add_listener(self.event_index)
+        self.nodes = ResourceInformer("nodes", core.list_node, node_record,
+                                      key_fn=lambda record: record["name"], watch_timeout=watch_timeout)
+        self.deployments = ResourceInformer("deployments", apps.list_deployment_for_all_namespaces,
+                                            deployment_record, watch_timeout=watch_timeout)
+        self.informers = [self.pods, self.events, self.nodes, self.deployments]
+
+        # Problem pods and nodes are tracked from the same watch events
+        self.health = ClusterHealth(interval_seconds=Config.HEALTH_SNAPSHOT_INTERVAL_SECONDS,
+                                    budget_tokens=Config.HEALTH_SNAPSHOT_TOKEN_BUDGET)
+        self.pods.add_listener(self.health.pods)
+        self.nodes.add_listener(self.health.nodes)
+
+    def start(self):
+        for informer in self.informers:
+            informer.start()
+        if Config.ENABLE_HEALTH_SNAPSHOT:
+            self.health.start()
+
+    def stop(self):
+        for informer in self.informers:
+            informer.stop()
+        self.health.stop()
+
+    def fresh(self, *informers: ResourceInformer) -> bool:
+        """Whether the given informers are synced and recent enough to answer from."""
+        return all(
+            informer.synced.is_set() and informer.staleness() <= Config.CLUSTER_CACHE_MAX_STALENESS_SECONDS
+            for informer in informers
+        )
+
+    def staleness_note(self, *informers: ResourceInformer) -> str:
+        """One-line freshness indicator appended to tool output."""
+        age = max(informer.staleness() for informer in informers)
+        return f"(from cluster cache, updated {age:.0f}s ago)"
+
+    def health_snapshot(self) -> Optional[str]:
+        """The background health snapshot, or None if it is disabled or the cache is stale."""
+        if not Config.ENABLE_HEALTH_SNAPSHOT or not self.fresh(self.pods, self.nodes):
+            return None
+        return self.health.snapshot()
+
+    def deployment_for(self, pod: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The deployment that owns a pod through its ReplicaSet, if it is cached."""
+        owner = pod.get("owner") or ""
+        if not owner.startswith("ReplicaSet/"):
+            return None
+        # ReplicaSets are named <deployment>-<pod-template-hash>
+        name = owner.split("/", 1)[1].rsplit("-", 1)[0]
+        return self.deployments.get((pod["namespace"], name))
+
+    def pods_in(self, namespace: Optional[str] = None) -> List[Dict[str, Any]]:
+        pods = self.pods.values()
+        if namespace:
+            pods = [pod for pod in pods if pod["namespace"] == namespace]
+        return pods
+
+
+_cache: Optional[ClusterCache] = None
+_cache_lock = threading.Lock()
+
+
+def start_cluster_cache() -> Optional[ClusterCache]:
+    """Start the process-wide cluster cache if it is enabled."""
+    global _cache
+    if not Config.ENABLE_CLUSTER_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = ClusterCache(
+                    max_events=Config.CLUSTER_CACHE_MAX_EVENTS,
+                    max_event_age=Config.CLUSTER_CACHE_EVENT_MAX_AGE_SECONDS,
+                    watch_timeout=Config.CLUSTER_CACHE_WATCH_TIMEOUT_SECONDS
+                )
+                _cache.start()
+                logger.info("Cluster cache started")
+            except Exception as e:
+                logger.warning(f"Could not start cluster cache: {e}")
+                return None
+        return _cache
+
+
+def get_cluster_cache() -> Optional[ClusterCache]:
+    """The running cluster cache, or None if it was never started."""
+    return _cache
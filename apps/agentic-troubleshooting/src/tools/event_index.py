@@ -0,0 +1,144 @@
+"""Time-ordered index of recent Kubernetes events."""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+# Events can arrive slightly out of time order; queries scan this far past their cutoff
+_ORDER_SLACK_SECONDS = 120
+
+
+class EventIndex:
+    """Recent events bounded by age and count, looked up by object or by reason.
+
+    Entries are kept in arrival order (an update moves an event to the end),
+    which tracks event time closely enough that pruning and window queries
+    only walk the part of the index they need.
+    """
+
+    def __init__(self, max_events: int, max_age_seconds: float):
+        self.max_events = max_events
+        self.max_age_seconds = max_age_seconds
+        self._events: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._by_object: Dict[Hashable, Set[Hashable]] = {}
+        self._by_reason: Dict[Hashable, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+
+    # Informer listener interface
+    def reset(self, records: Iterable[Dict[str, Any]]):
+        """Rebuild from a full list."""
+        with self._lock:
+            self._events.clear()
+            self._by_object.clear()
+            self._by_reason.clear()
+            for record in sorted(records, key=lambda r: r["last_seen"] or 0):
+                self._insert_locked(record)
+            self._prune_locked()
+
+    def apply(self, event_type: str, record: Dict[str, Any]):
+        """Apply one watch event."""
+        with self._lock:
+            if event_type == "DELETED":
+                self._remove_locked(self._key(record))
+            else:
+                self._insert_locked(record)
+                self._prune_locked()
+
+    def for_object(self, namespace: str, name: str, kind: Optional[str] = None,
+                   limit: int = 5) -> List[Dict[str, Any]]:
+        """The most recent events about one object, oldest first."""
+        with self._lock:
+            keys = self._by_object.get((namespace, name), ())
+            events = [self._events[key] for key in keys]
+        if kind:
+            events = [event for event in events if event["kind"] == kind]
+        events.sort(key=lambda event: event["last_seen"] or 0)
+        return events[-limit:]
+
+    def for_reason(self, namespace: str, reason: str) -> List[Dict[str, Any]]:
+        """Events with one reason in a namespace, oldest first."""
+        with self._lock:
+            keys = self._by_reason.get((namespace, reason), ())
+            events = [self._events[key] for key in keys]
+        return sorted(events, key=lambda event: event["last_seen"] or 0)
+
+    def since(self, seconds: float, namespace: Optional[str] = None,
+              event_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Events last seen within the window, newest first."""
+        cutoff = time.time() - seconds
+        events = []
+        with self._lock:
+            for event in reversed(self._events.values()):
+                last_seen = event["last_seen"] or 0
+                if last_seen < cutoff - _ORDER_SLACK_SECONDS:
+                    break
+                if last_seen < cutoff:
+                    continue
+                if namespace and event["namespace"] != namespace:
+                    continue
+                if event_type and event["type"] != event_type:
+                    continue
+                events.append(event)
+        return events
+
+    def top_reasons(self, seconds: float, namespace: Optional[str] = None,
+                    event_type: str = "Warning", top: int = 10) -> List[Dict[str, Any]]:
+        """Most frequent reasons in the window, with affected objects and a sample message.
+        
+        Each event counts once: its count field is a lifetime total, so a
+        long-running BackOff would otherwise outrank everything that happened
+        in the window.
+        """
+        occurrences: Counter = Counter()
+        objects: Dict[tuple, Set[str]] = {}
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        for event in self.since(seconds, namespace, event_type):
+            key = (event["namespace"], event["reason"])
+            occurrences[key] += 1
+            objects.setdefault(key, set()).add(f"{event['kind']}/{event['object']}")
+            latest.setdefault(key, event)
+
+        return [
+            {
+                "namespace": key[0],
+                "reason": key[1],
+                "events": count,
+                "objects": sorted(objects[key]),
+                "message": latest[key]["message"]
+            }
+            for key, count in occurrences.most_common(top)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _key(self, record: Dict[str, Any]) -> Hashable:
+        return (record["namespace"], record["name"])
+
+    def _insert_locked(self, record: Dict[str, Any]):
+        key = self._key(record)
+        self._remove_locked(key)
+        self._events[key] = record
+        self._by_object.setdefault((record["namespace"], record["object"]), set()).add(key)
+        self._by_reason.setdefault((record["namespace"], record["reason"]), set()).add(key)
+
+    def _remove_locked(self, key: Hashable):
+        record = self._events.pop(key, None)
+        if record is None:
+            return
+        for index, index_key in ((self._by_object, (record["namespace"], record["object"])),
+                                 (self._by_reason, (record["namespace"], record["reason"]))):
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    def _prune_locked(self):
+        cutoff = time.time() - self.max_age_seconds
+        while self._events:
+            key, oldest = next(iter(self._events.items()))
+            if len(self._events) <= self.max_events and (oldest["last_seen"] or 0) >= cutoff:
+                break
+            self._remove_locked(key)
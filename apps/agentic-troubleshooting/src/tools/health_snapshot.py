@@ -0,0 +1,202 @@
+"""Cluster health snapshot maintained from the cluster cache's watch stream.
+
+Problem pods and NotReady nodes are tracked incrementally as informer events
+arrive, so building a snapshot only reads the per-namespace counters. A
+background thread re-renders the snapshot when something changed and notes
+what moved since the previous one.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
+from src.tools.output_format import Table, fit_budget
+
+logger = logging.getLogger(__name__)
+
+PROBLEMS = ["CrashLoopBackOff", "OOMKilled", "ImagePullBackOff", "Pending"]
+IMAGE_PULL_REASONS = {"ImagePullBackOff", "ErrImagePull"}
+MAX_EXAMPLES = 3
+
+
+def pod_problems(pod: Dict[str, Any]) -> FrozenSet[str]:
+    """Which snapshot problems a pod record shows, if any."""
+    problems = set()
+    for container in pod["containers"]:
+        if container["reason"] == "CrashLoopBackOff":
+            problems.add("CrashLoopBackOff")
+        # The last termination record outlives recovery, so it only counts while
+        # the container is still unhealthy
+        recovering = not container["ready"] or container["state"] == "Waiting"
+        if container["reason"] == "OOMKilled" or (recovering and container["last_reason"] == "OOMKilled"):
+            problems.add("OOMKilled")
+        if container["reason"] in IMAGE_PULL_REASONS:
+            problems.add("ImagePullBackOff")
+    # Image pulls also leave the pod Pending; count it under the specific cause only
+    if pod["phase"] == "Pending" and not problems:
+        problems.add("Pending")
+    return frozenset(problems)
+
+
+def node_problems(node: Dict[str, Any]) -> FrozenSet[str]:
+    return frozenset() if node["ready"] else frozenset({"NotReady"})
+
+
+class ProblemTracker:
+    """Informer listener keeping only the objects that have problems, plus counts.
+
+    Each watch event adjusts the counters by the difference between the
+    object's old and new problems, so the cost is per change, not per object.
+    """
+
+    def __init__(self, classify: Callable[[Dict[str, Any]], FrozenSet[str]],
+                 key_fn: Callable[[Dict[str, Any]], Hashable],
+                 on_reset: Optional[Callable[[], None]] = None):
+        self.classify = classify
+        self.key_fn = key_fn
+        self.on_reset = on_reset
+        self.version = 0
+        self.synced = threading.Event()
+        self._problems: Dict[Hashable, Tuple[Optional[str], FrozenSet[str]]] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def reset(self, records: List[Dict[str, Any]]):
+        problems = {}
+        counts: Counter = Counter()
+        for record in records:
+            found = self.classify(record)
+            if found:
+                problems[self.key_fn(record)] = (record.get("namespace"), found)
+                counts.update((record.get("namespace"), problem) for problem in found)
+        with self._lock:
+            self._problems = problems
+            self._counts = counts
+            self.version += 1
+        self.synced.set()
+        if self.on_reset:
+            self.on_reset()
+
+    def apply(self, event_type: str, record: Dict[str, Any]):
+        key = self.key_fn(record)
+        found = frozenset() if event_type == "DELETED" else self.classify(record)
+        with self._lock:
+            namespace, previous = self._problems.pop(key, (None, frozenset()))
+            if previous == found:
+                if found:
+                    self._problems[key] = (namespace, found)
+                return
+            for problem in previous:
+                self._counts[(namespace, problem)] -= 1
+                if self._counts[(namespace, problem)] <= 0:
+                    del self._counts[(namespace, problem)]
+            if found:
+                namespace = record.get("namespace")
+                self._problems[key] = (namespace, found)
+                self._counts.update((namespace, problem) for problem in found)
+            self.version += 1
+
+    def counts(self) -> Counter:
+        with self._lock:
+            return Counter(self._counts)
+
+    def examples(self, limit: int = MAX_EXAMPLES) -> Dict[Tuple[Optional[str], str], List[str]]:
+        """A few object names per (namespace, problem)."""
+        examples: Dict[Tuple[Optional[str], str], List[str]] = {}
+        with self._lock:
+            for key, (namespace, found) in self._problems.items():
+                name = key[-1] if isinstance(key, tuple) else key
+                for problem in found:
+                    names = examples.setdefault((namespace, problem), [])
+                    if len(names) < limit:
+                        names.append(name)
+        return examples
+
+
+class ClusterHealth:
+    """Periodically refreshed, compact health snapshot of pods and nodes."""
+
+    def __init__(self, interval_seconds: float, budget_tokens: int):
+        self.interval_seconds = interval_seconds
+        self.budget_tokens = budget_tokens
+        self._wake = threading.Event()
+        self.pods = ProblemTracker(pod_problems, lambda record: (record["namespace"], record["name"]),
+                                   on_reset=self._wake.set)
+        self.nodes = ProblemTracker(node_problems, lambda record: record["name"], on_reset=self._wake.set)
+        self._text: Optional[str] = None
+        self._taken = 0.0
+        self._versions: Optional[Tuple[int, int]] = None
+        self._previous: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="health-snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def snapshot(self) -> Optional[str]:
+        """The latest snapshot with its age, or None before the first one."""
+        if self._text is None:
+            return None
+        return f"Cluster health snapshot (taken {time.monotonic() - self._taken:.0f}s ago):\n{self._text}"
+
+    def refresh(self) -> bool:
+        """Rebuild the snapshot if anything changed since the last one. Returns True if rebuilt.
+        
+        Nothing is rendered until both trackers have seen a full list, so an
+        empty tracker is never reported as a healthy cluster.
+        """
+        if not (self.pods.synced.is_set() and self.nodes.synced.is_set()):
+            return False
+        versions = (self.pods.version, self.nodes.version)
+        if versions == self._versions:
+            return False
+
+        counts = self.pods.counts() + self.nodes.counts()
+        examples = {**self.pods.examples(), **self.nodes.examples()}
+        self._text = self._render(counts, examples, self._diff(counts))
+        self._previous = counts
+        self._versions = versions
+        self._taken = time.monotonic()
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Health snapshot error: {e}")
+            # A relist wakes the thread early so the snapshot never lags a full list
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
+
+    def _diff(self, counts: Counter) -> List[str]:
+        if self._versions is None:
+            return []
+        changes = []
+        for key in sorted(set(counts) | set(self._previous), key=lambda k: (k[1], k[0] or "")):
+            delta = counts[key] - self._previous[key]
+            if delta:
+                namespace, problem = key
+                changes.append(f"{problem} {namespace or 'nodes'} {delta:+d}")
+        return changes
+
+    def _render(self, counts: Counter, examples: Dict[Tuple[Optional[str], str], List[str]],
+                changes: List[str]) -> str:
+        if not counts:
+            lines = ["No CrashLoopBackOff, OOMKilled, ImagePullBackOff or Pending pods, and no NotReady nodes."]
+        else:
+            order = {problem: index for index, problem in enumerate(PROBLEMS + ["NotReady"])}
+            table = Table(["problem", "namespace", "count", "examples"])
+            for (namespace, problem), count in sorted(
+                counts.items(), key=lambda item: (order[item[0][1]], -item[1], item[0][0] or "")
+            ):
+                table.add(problem, namespace or "(nodes)", count, ",".join(examples.get((namespace, problem), [])))
+            lines = table.lines()
+        footer = [f"Changes since previous snapshot: {'; '.join(changes)}"] if changes else []
+        return fit_budget(lines, self.budget_tokens, footer).rstrip("\n")
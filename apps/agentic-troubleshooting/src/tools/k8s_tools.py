@@ -1,12 +1,26 @@
 """Simple Kubernetes tools for troubleshooting."""
 
 import logging
-from typing import Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from kubernetes import client, config
 from strands import tool
+from src.config.settings import Config
+from src.tools.cluster_cache import event_record, get_cluster_cache, pod_record
+from src.tools.event_index import EventIndex
+from src.tools.log_scanner import LogScanner
+from src.tools.output_format import Table, finish
+from src.tools.selectors import field_matcher, label_matcher
+from src.utils.text import normalize_message
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 500
+DEFAULT_MAX_ROWS = 100
+DIAGNOSE_MAX_PODS = 200
+LOG_CHUNK_SIZE = 64 * 1024
+
 # Try to load Kubernetes configuration
 try:
     config.load_incluster_config()  # Try in-cluster first
@@ -29,84 +43,478 @@ def describe_pod(namespace: str, pod_name: str) -> str:
         Pod description or error message
     """
     try:
-        v1 = client.CoreV1Api()
-        pod = v1.read_namespaced_pod(name=pod_name, namespace=namespace)
+        cache = get_cluster_cache()
+        pod = None
+        if cache and cache.fresh(cache.pods, cache.events):
+            # A pod missing from the cache may be brand new, so ask the API server
+            pod = cache.pods.get((namespace, pod_name))
+        if pod is not None:
+            events = cache.event_index.for_object(namespace, pod_name, kind="Pod")
+            source = cache.staleness_note(cache.pods, cache.events)
+        else:
+            v1 = client.CoreV1Api()
+            pod = pod_record(v1.read_namespaced_pod(name=pod_name, namespace=namespace))
+            events = v1.list_namespaced_event(
+                namespace=namespace,
+                field_selector=f"involvedObject.name={pod_name}"
+            )
+            events = sorted(
+                (event_record(event) for event in events.items),
+                key=lambda event: event["last_seen"] or 0
+            )
+            source = "(live from API server)"
         
-        # Format basic pod info
-        output = f"Name: {pod.metadata.name}\n"
-        output += f"Namespace: {pod.metadata.namespace}\n"
-        output += f"Node: {pod.spec.node_name}\n"
-        output += f"Status: {pod.status.phase}\n"
-        output += f"IP: {pod.status.pod_ip}\n\n"
+        # Basic pod info
+        lines = [
+            f"Pod {pod['namespace']}/{pod['name']}: {pod_status(pod)} (phase {pod['phase']}) "
+            f"on node {pod['node'] or '-'}, IP {pod['ip'] or '-'}"
+        ]
+        for condition in pod["conditions"]:
+            lines.append(f"{condition['type']}=False: {condition['reason'] or '-'} {condition['message'] or ''}".rstrip())
         
         # Container statuses
-        output += "Containers:\n"
-        if pod.status.container_statuses:
-            for cs in pod.status.container_statuses:
-                output += f"  {cs.name}:\n"
-                output += f"    Ready: {cs.ready}\n"
-                output += f"    Restarts: {cs.restart_count}\n"
-                if cs.state.running:
-                    output += f"    State: Running\n"
-                elif cs.state.waiting:
-                    output += f"    State: Waiting ({cs.state.waiting.reason})\n"
-                elif cs.state.terminated:
-                    output += f"    State: Terminated ({cs.state.terminated.reason})\n"
+        containers = Table(["CONTAINER", "READY", "RESTARTS", "STATE", "REASON", "EXIT", "LAST", "MESSAGE"], elide_columns=0)
+        for container in pod["containers"]:
+            last = container["last_reason"]
+            if last and container["last_exit_code"] is not None:
+                last = f"{last}({container['last_exit_code']})"
+            containers.add(container["name"], container["ready"], container["restarts"], container["state"],
+                           container["reason"], container["exit_code"], last, container["message"])
+        lines.extend(containers.lines())
         
         # Events
-        events = v1.list_namespaced_event(
-            namespace=namespace,
-            field_selector=f"involvedObject.name={pod_name}"
-        )
-        if events.items:
-            output += "\nRecent Events:\n"
-            for event in events.items[-5:]:  # Last 5 events
-                output += f"  {event.type}: {event.reason} - {event.message}\n"
-        
-        return output
+        raw_bytes = containers.raw_bytes
+        if events:
+            recent = Table(["TYPE", "REASON", "COUNT", "MESSAGE"], elide_columns=2)
+            for event in events[-5:]:  # Last 5 events
+                recent.add(event["type"], event["reason"], event["count"], event["message"])
+            lines.append("Recent events:")
+            lines.extend(recent.lines())
+            raw_bytes += recent.raw_bytes
+        
+        raw_bytes += sum(len(line) + 1 for line in lines[:1 + len(pod["conditions"])])
+        return finish("describe_pod", lines, footer=[source], raw_bytes=raw_bytes)
     except Exception as e:
         return f"Error describing pod: {str(e)}"
 
 
+def pod_status(pod: dict) -> str:
+    """Status column as kubectl shows it: the most specific container reason, else the phase."""
+    if pod["status_reason"]:
+        return pod["status_reason"]
+    for container in pod["containers"]:
+        if container["state"] != "Running" and container["reason"]:
+            return container["reason"]
+    return pod["phase"] or "Unknown"
+
+
+def _list_pods(namespace: Optional[str], label_selector: Optional[str],
+               field_selector: Optional[str]) -> Tuple[Iterator[dict], str]:
+    """Pod records matching the selectors, from the cluster cache when it can answer."""
+    cache = get_cluster_cache()
+    if cache and cache.fresh(cache.pods):
+        labels = label_matcher(label_selector)
+        fields = field_matcher(field_selector)
+        if labels and fields:
+            pods = sorted(
+                (pod for pod in cache.pods_in(namespace) if labels(pod) and fields(pod)),
+                key=lambda pod: (pod["namespace"], pod["name"])
+            )
+            return iter(pods), cache.staleness_note(cache.pods)
+    
+    return _page_pods(namespace, label_selector, field_selector), "(live from API server)"
+
+
+def _page_pods(namespace: Optional[str], label_selector: Optional[str],
+               field_selector: Optional[str]) -> Iterator[dict]:
+    """Page through the API server with limit/continue so no response holds every pod."""
+    v1 = client.CoreV1Api()
+    kwargs = {"limit": PAGE_SIZE}
+    if label_selector:
+        kwargs["label_selector"] = label_selector
+    if field_selector:
+        kwargs["field_selector"] = field_selector
+    
+    while True:
+        if namespace:
+            page = v1.list_namespaced_pod(namespace=namespace, **kwargs)
+        else:
+            page = v1.list_pod_for_all_namespaces(**kwargs)
+        for pod in page.items:
+            yield pod_record(pod)
+        if not page.metadata._continue:
+            return
+        kwargs["_continue"] = page.metadata._continue
+
+
+def _status_matches(status: str, status_filter: Optional[str]) -> bool:
+    if not status_filter:
+        return True
+    if status_filter.startswith("!"):
+        return status.lower() != status_filter[1:].lower()
+    return status.lower() == status_filter.lower()
+
+
 @tool
-def get_pods(namespace: Optional[str] = None) -> str:
+def get_pods(namespace: Optional[str] = None, label_selector: Optional[str] = None,
+             field_selector: Optional[str] = None, status: Optional[str] = None,
+             min_restarts: int = 0, max_rows: int = DEFAULT_MAX_ROWS,
+             show_healthy: bool = False) -> str:
     """Get list of pods (similar to kubectl get pods).
     
+    Healthy pods (Running, all containers ready, no restarts) are counted per
+    namespace instead of listed, unless show_healthy is set or a status filter is given.
+    
     Args:
         namespace: Optional namespace. If not provided, gets pods from all namespaces
+        label_selector: Optional label selector, e.g. "app=checkout,tier!=cache"
+        field_selector: Optional field selector, e.g. "spec.nodeName=ip-10-0-1-5"
+        status: Only pods with this status (e.g. "CrashLoopBackOff"); prefix with "!" to exclude one (e.g. "!Running")
+        min_restarts: Only pods whose containers restarted at least this many times
+        max_rows: Maximum number of pods to list; the rest are summarized
+        show_healthy: List healthy pods too
     
     Returns:
         List of pods or error message
     """
     try:
-        v1 = client.CoreV1Api()
+        pods, source = _list_pods(namespace, label_selector, field_selector)
+        list_healthy = show_healthy or bool(status)
         
-        if namespace:
-            pods = v1.list_namespaced_pod(namespace=namespace)
-            output = f"Pods in namespace {namespace}:\n"
+        table = Table(["NAMESPACE", "NAME", "READY", "STATUS", "RESTARTS"])
+        matched = 0
+        healthy = Counter()
+        omitted = Counter()
+        summarized_bytes = 0
+        for pod in pods:
+            containers = pod["containers"]
+            pod_state = pod_status(pod)
+            restarts = sum(container["restarts"] for container in containers)
+            if restarts < min_restarts or not _status_matches(pod_state, status):
+                continue
+            
+            matched += 1
+            ready_containers = sum(1 for container in containers if container["ready"])
+            ready_str = f"{ready_containers}/{len(containers)}"
+            row = (pod["namespace"], pod["name"], ready_str, pod_state, restarts)
+            
+            if not list_healthy and pod_state == "Running" and ready_containers == len(containers) and not restarts:
+                healthy[pod["namespace"]] += 1
+            elif len(table) >= max_rows:
+                omitted[pod_state] += 1
+            else:
+                table.add(*row)
+                continue
+            summarized_bytes += len("\t".join(str(value) for value in row)) + 1
+        
+        scope = f"namespace {namespace}" if namespace else "all namespaces"
+        lines = [f"Pods in {scope}: {matched} matched"]
+        lines.extend(table.lines() if len(table) else ["No unhealthy pods"])
+        if healthy:
+            counts = ", ".join(f"{ns}={count}" for ns, count in healthy.most_common())
+            lines.append(f"{sum(healthy.values())} healthy pods not listed ({counts})")
+        if omitted:
+            counts = ", ".join(f"{state}={count}" for state, count in omitted.most_common())
+            lines.append(
+                f"... {sum(omitted.values())} more pods omitted ({counts}); "
+                "narrow the query with selectors or filters to see them"
+            )
+        return finish("get_pods", lines, footer=[source], raw_bytes=table.raw_bytes + summarized_bytes)
+    except Exception as e:
+        return f"Error getting pods: {str(e)}"
+
+
+@tool
+def get_warning_summary(namespace: Optional[str] = None, minutes: int = 15, top: int = 10) -> str:
+    """Summarize the most frequent warning event reasons in a recent time window.
+    
+    Args:
+        namespace: Optional namespace. If not provided, covers all namespaces
+        minutes: How far back to look
+        top: Number of reasons to return
+    
+    Returns:
+        Warning reasons with the number of events seen in the window, affected objects
+        and a sample message
+    """
+    try:
+        cache = get_cluster_cache()
+        if cache and cache.fresh(cache.events):
+            index = cache.event_index
+            source = cache.staleness_note(cache.events)
         else:
-            pods = v1.list_pod_for_all_namespaces()
-            output = "Pods in all namespaces:\n"
+            index = _warning_index(namespace, minutes)
+            source = "(live from API server)"
         
-        output += f"{'NAMESPACE':<15} {'NAME':<40} {'READY':<7} {'STATUS':<20} {'RESTARTS':<10}\n"
-        output += "-" * 95 + "\n"
+        reasons = index.top_reasons(minutes * 60, namespace=namespace, top=top)
+        scope = f"namespace {namespace}" if namespace else "all namespaces"
+        if not reasons:
+            return f"No warning events in {scope} in the last {minutes} minutes {source}\n"
         
-        for pod in pods.items:
-            ready_containers = 0
-            total_containers = 0
-            restarts = 0
-            
-            if pod.status.container_statuses:
-                total_containers = len(pod.status.container_statuses)
-                for cs in pod.status.container_statuses:
-                    if cs.ready:
-                        ready_containers += 1
-                    restarts += cs.restart_count
+        table = Table(["NAMESPACE", "REASON", "EVENTS", "OBJECTS", "SAMPLE", "MESSAGE"])
+        for entry in sorted(reasons, key=lambda entry: (entry["namespace"], -entry["events"])):
+            objects = entry["objects"]
+            sample = ",".join(objects[:3]) + (f" +{len(objects) - 3}" if len(objects) > 3 else "")
+            table.add(entry["namespace"], entry["reason"], entry["events"], len(objects), sample, entry["message"])
+        
+        lines = [f"Top warning reasons in {scope}, last {minutes} minutes:"] + table.lines()
+        return finish("get_warning_summary", lines, footer=[source], raw_bytes=table.raw_bytes)
+    except Exception as e:
+        return f"Error summarizing warning events: {str(e)}"
+
+
+def _warning_index(namespace: Optional[str], minutes: int) -> EventIndex:
+    """Build a one-off index from warning events listed page by page."""
+    v1 = client.CoreV1Api()
+    index = EventIndex(max_events=Config.CLUSTER_CACHE_MAX_EVENTS, max_age_seconds=minutes * 60)
+    kwargs = {"limit": PAGE_SIZE, "field_selector": "type=Warning"}
+    records = []
+    while True:
+        if namespace:
+            page = v1.list_namespaced_event(namespace=namespace, **kwargs)
+        else:
+            page = v1.list_event_for_all_namespaces(**kwargs)
+        records.extend(event_record(event) for event in page.items)
+        if not page.metadata._continue:
+            break
+        kwargs["_continue"] = page.metadata._continue
+    index.reset(records)
+    return index
+
+
+def _failure_signature(pod: dict) -> Optional[Tuple[str, Optional[int], str]]:
+    """(reason, exit code, normalized message) for an unhealthy pod, or None if it looks healthy."""
+    if pod["phase"] == "Succeeded":
+        return None
+    # A current waiting/terminated reason on any container (e.g. behind a healthy
+    # sidecar) outranks restart history and readiness; clean exits are not failures
+    for container in pod["containers"]:
+        if container["state"] == "Terminated" and container["exit_code"] == 0:
+            continue
+        if container["state"] != "Running" and container["reason"]:
+            return (container["reason"], container["exit_code"], normalize_message(container["message"] or ""))
+    
+    if pod["status_reason"]:
+        return (pod["status_reason"], None, "")
+    for container in pod["containers"]:
+        if container["restarts"] and container["last_reason"]:
+            # Running again, but the last crash is what needs explaining
+            return (f"Restarted after {container['last_reason']}", container["last_exit_code"], "")
+    for container in pod["containers"]:
+        if not container["ready"] and pod["phase"] == "Running":
+            return ("NotReady", None, "")
+    
+    if pod["phase"] not in ("Running", "Succeeded"):
+        condition = pod["conditions"][0] if pod["conditions"] else {}
+        return (condition.get("reason") or pod["phase"] or "Unknown", None,
+                normalize_message(condition.get("message") or ""))
+    return None
+
+
+def _fetch_pod_details(namespace: str, names: Optional[List[str]], label_selector: Optional[str]
+                       ) -> Tuple[List[Tuple[dict, List[dict]]], int, List[str], str]:
+    """Pods with their events, from the cluster cache or fetched concurrently from the API server.
+    
+    Returns (details, pods found, names that could not be fetched, source note);
+    details cover at most DIAGNOSE_MAX_PODS of the pods found.
+    """
+    v1 = client.CoreV1Api()
+    
+    def fetch(name: str, pod: Optional[dict] = None) -> Tuple[dict, List[dict]]:
+        if pod is None:
+            pod = pod_record(v1.read_namespaced_pod(name=name, namespace=namespace))
+        events = v1.list_namespaced_event(namespace=namespace, field_selector=f"involvedObject.name={name}")
+        return pod, sorted((event_record(e) for e in events.items), key=lambda e: e["last_seen"] or 0)
+    
+    cache = get_cluster_cache()
+    if cache and cache.fresh(cache.pods, cache.events):
+        labels = label_matcher(label_selector)
+        if labels:
+            missing: List[str] = []
+            if names:
+                pods = []
+                for name in names:
+                    pod = cache.pods.get((namespace, name))
+                    if pod is None:
+                        missing.append(name)
+                    else:
+                        pods.append(pod)
+            else:
+                pods = [pod for pod in cache.pods_in(namespace) if labels(pod)]
+            found = len(pods) + len(missing)
+            pods = pods[:DIAGNOSE_MAX_PODS]
+            details = [
+                (pod, cache.event_index.for_object(namespace, pod["name"], kind="Pod"))
+                for pod in pods
+            ]
             
-            ready_str = f"{ready_containers}/{total_containers}"
+            # Like describe_pod, names the cache has not seen yet go to the API server
+            targets = [(name, None) for name in missing[:DIAGNOSE_MAX_PODS - len(pods)]]
+            fetched, failed = _fetch_all(fetch, targets)
+            details.extend(fetched)
+            source = cache.staleness_note(cache.pods, cache.events)
+            if targets:
+                source += f" ({len(targets)} pods not yet in cache fetched live)"
+            return details, found - len(failed), failed, source
+    
+    if names:
+        targets = [(name, None) for name in names]
+    else:
+        targets = [(pod["name"], pod) for pod in _page_pods(namespace, label_selector, None)]
+    found = len(targets)
+    details, failed = _fetch_all(fetch, targets[:DIAGNOSE_MAX_PODS])
+    return details, found - len(failed), failed, "(live from API server)"
+
+
+def _fetch_all(fetch: Callable, targets: List[Tuple[str, Optional[dict]]]
+               ) -> Tuple[List[Tuple[dict, List[dict]]], List[str]]:
+    """Run fetch(name, pod) concurrently; returns the details and the names that failed."""
+    details, failed = [], []
+    if not targets:
+        return details, failed
+    with ThreadPoolExecutor(max_workers=min(Config.DIAGNOSE_MAX_WORKERS, len(targets))) as executor:
+        futures = [(name, executor.submit(fetch, name, pod)) for name, pod in targets]
+        for name, future in futures:
+            try:
+                details.append(future.result())
+            except Exception as e:
+                logger.warning(f"Could not fetch pod details for {name}: {e}")
+                failed.append(name)
+    return details, failed
+
+
+def _rollouts(pods: List[dict], limit: int = 3) -> List[str]:
+    """Rollout state of the deployments owning the pods, from the cluster cache."""
+    cache = get_cluster_cache()
+    if not cache or not cache.fresh(cache.deployments):
+        return []
+    deployments = {}
+    for pod in pods:
+        deployment = cache.deployment_for(pod)
+        if deployment is not None:
+            deployments.setdefault(deployment["name"], deployment)
+    return [
+        f"deployment {d['name']}: {d['ready']}/{d['replicas']} ready, {d['updated']} updated, "
+        f"{d['available']} available"
+        for d in list(deployments.values())[:limit]
+    ]
+
+
+@tool
+def diagnose_pods(namespace: str, label_selector: Optional[str] = None,
+                  pod_names: Optional[List[str]] = None) -> str:
+    """Diagnose many pods in one call, grouping them by identical failure signature.
+    
+    Use this instead of describing failing replicas one at a time.
+    
+    Args:
+        namespace: The Kubernetes namespace
+        label_selector: Optional label selector for the pods, e.g. "app=checkout"
+        pod_names: Optional list of pod names; used instead of the selector when given
+    
+    Returns:
+        One entry per failure signature with pod count, sample pods, restarts, recent events
+        and the rollout state of the owning deployments
+    """
+    try:
+        details, found, failed, source = _fetch_pod_details(namespace, pod_names, label_selector)
+        not_found = f"Could not fetch: {', '.join(failed)}\n" if failed else ""
+        if not details:
+            return f"{not_found}No matching pods in namespace {namespace} {source}\n"
+        
+        groups: Dict[tuple, List[Tuple[dict, List[dict]]]] = {}
+        healthy = 0
+        for pod, events in details:
+            signature = _failure_signature(pod)
+            if signature is None:
+                healthy += 1
+                continue
+            groups.setdefault(signature, []).append((pod, events))
+        
+        lines = [f"Diagnosed {len(details)} pods in {namespace}: {len(details) - healthy} unhealthy, {healthy} healthy"]
+        if found > len(details):
+            lines[0] += (f" (found {found}; only the first {len(details)} were diagnosed, "
+                         f"narrow with label_selector or pod_names)")
+        if failed:
+            lines.append(not_found.rstrip())
+        for (reason, exit_code, _), members in sorted(groups.items(), key=lambda item: -len(item[1])):
+            sample_pod, sample_events = members[0]
+            names = [pod["name"] for pod, _ in members]
+            restarts = sum(c["restarts"] for pod, _ in members for c in pod["containers"])
+            exit_note = f", exit code {exit_code}" if exit_code is not None else ""
+            lines.append(f"\n{reason}{exit_note}: {len(members)} pods, {restarts} restarts")
+            lines.append(f"  Pods: {', '.join(names[:5])}" + (f" and {len(names) - 5} more" if len(names) > 5 else ""))
             
-            output += f"{pod.metadata.namespace:<15} {pod.metadata.name:<40} {ready_str:<7} {pod.status.phase:<20} {restarts:<10}\n"
+            message = next((c["message"] for c in sample_pod["containers"] if c["message"]), None)
+            if not message and sample_pod["conditions"]:
+                message = sample_pod["conditions"][0]["message"]
+            if message:
+                lines.append(f"  Message: {message}")
+            for event in sample_events[-3:]:
+                lines.append(f"  Event: {event['type']} {event['reason']} - {event['message']}")
+            for rollout in _rollouts([pod for pod, _ in members]):
+                lines.append(f"  Rollout: {rollout}")
         
-        return output
+        return finish("diagnose_pods", lines, footer=[source])
     except Exception as e:
-        return f"Error getting pods: {str(e)}"
+        return f"Error diagnosing pods: {str(e)}"
+
+
+@tool
+def scan_pod_logs(namespace: str, pod_name: str, container: Optional[str] = None,
+                  tail_lines: int = 1000, since_minutes: Optional[int] = None,
+                  previous: bool = False) -> str:
+    """Scan a pod's logs for OOM, panic, stack trace, exception and error lines.
+    
+    Returns matched excerpts and counts plus the last few lines instead of the raw log.
+    
+    Args:
+        namespace: The Kubernetes namespace
+        pod_name: The name of the pod
+        container: Container name, required when the pod has more than one
+        tail_lines: Number of most recent lines to scan
+        since_minutes: Only scan lines from the last N minutes
+        previous: Scan the previous (crashed) container instance instead of the current one
+    
+    Returns:
+        Pattern counts, excerpts and the log tail, or error message
+    """
+    try:
+        v1 = client.CoreV1Api()
+        kwargs = {
+            "tail_lines": min(tail_lines, Config.LOG_MAX_TAIL_LINES),
+            "limit_bytes": Config.LOG_LIMIT_BYTES,
+            "previous": previous,
+            "_preload_content": False
+        }
+        if container:
+            kwargs["container"] = container
+        if since_minutes:
+            kwargs["since_seconds"] = since_minutes * 60
+        
+        response = v1.read_namespaced_pod_log(name=pod_name, namespace=namespace, **kwargs)
+        scanner = LogScanner(tail_lines=Config.LOG_RETURN_TAIL_LINES)
+        try:
+            scanner.feed_chunks(response.stream(LOG_CHUNK_SIZE))
+        finally:
+            response.release_conn()
+        
+        which = "previous" if previous else "current"
+        lines = [f"Logs of {namespace}/{pod_name}" + (f" ({container})" if container else "") +
+                 f", {which} container: scanned {scanner.lines} lines, {scanner.bytes} bytes"]
+        if scanner.bytes >= Config.LOG_LIMIT_BYTES:
+            lines.append(f"(stopped at the {Config.LOG_LIMIT_BYTES} byte limit; narrow with tail_lines or since_minutes)")
+        
+        if scanner.counts:
+            lines.append("Matches: " + ", ".join(f"{kind}={count}" for kind, count in scanner.counts.most_common()))
+            for number, excerpt in enumerate(scanner.excerpts, 1):
+                lines.append(f"\nExcerpt {number}:")
+                lines.extend(f"  {line}" for line in excerpt)
+        else:
+            lines.append("No OOM, panic, stack trace, exception or error lines found")
+        
+        lines.append("\nLast lines:")
+        lines.extend(f"  {line}" for line in scanner.tail)
+        return finish("scan_pod_logs", lines, raw_bytes=scanner.bytes)
+    except Exception as e:
+        return f"Error getting pod logs: {str(e)}"
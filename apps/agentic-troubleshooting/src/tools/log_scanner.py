@@ -0,0 +1,95 @@
+"""Incremental scanning of container logs for failure patterns."""
+
+import re
+from collections import Counter, deque
+from typing import Iterable, List, Optional
+
+# Checked in order; a line counts toward the first pattern it matches
+LOG_PATTERNS = [
+    ("oom", re.compile(
+        r"OutOfMemory|out of memory|OOMKilled|Cannot allocate memory|Killed process|memory limit exceeded",
+        re.IGNORECASE
+    )),
+    ("panic", re.compile(r"^panic: |\bfatal error: |\bSIGSEGV\b|segmentation fault", re.IGNORECASE)),
+    ("stack_trace", re.compile(r"Traceback \(most recent call last\)|^\s+File \".*\", line \d+|^\s+at [\w.$<>]+\(.*\)\s*$|^goroutine \d+ \[")),
+    ("exception", re.compile(r"\b[\w.]+(?:Exception|Error)\b(?::|$)")),
+    ("error", re.compile(r"\b(?:ERROR|FATAL|CRITICAL)\b|\blevel=(?:error|fatal)\b")),
+]
+
+MAX_LINE_CHARS = 500
+MAX_EXCERPT_LINES = 30
+
+
+class LogScanner:
+    """Feeds log lines through the patterns, keeping only counts, excerpts and a short tail.
+
+    Memory stays bounded no matter how much log is scanned: excerpts are
+    capped, and consecutive matches inside one excerpt (e.g. the frames of a
+    stack trace) extend it instead of starting a new one.
+    """
+
+    def __init__(self, max_excerpts: int = 10, context_lines: int = 2, tail_lines: int = 20):
+        self.max_excerpts = max_excerpts
+        self.context_lines = context_lines
+        self.counts: Counter = Counter()
+        self.excerpts: List[List[str]] = []
+        self.lines = 0
+        self.bytes = 0
+        self._before = deque(maxlen=context_lines)
+        self._tail = deque(maxlen=tail_lines)
+        self._open: Optional[List[str]] = None
+        self._after = 0
+
+    def feed(self, line: str):
+        self.bytes += len(line.encode("utf-8")) + 1
+        self._scan(line)
+
+    def feed_chunks(self, chunks: Iterable[bytes]):
+        """Split a byte stream into lines without holding more than one partial line."""
+        pending = b""
+        for chunk in chunks:
+            # Raw bytes, newlines included, so the total compares with the API's limit_bytes
+            self.bytes += len(chunk)
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                self._scan(line.decode("utf-8", errors="replace"))
+        if pending:
+            self._scan(pending.decode("utf-8", errors="replace"))
+
+    def _scan(self, line: str):
+        self.lines += 1
+        line = line.rstrip()
+        if len(line) > MAX_LINE_CHARS:
+            line = line[:MAX_LINE_CHARS] + "..."
+        self._tail.append(line)
+
+        kind = self._match(line)
+        if kind:
+            self.counts[kind] += 1
+            if self._open is not None:
+                self._open.append(line)
+                self._after = self.context_lines
+            elif len(self.excerpts) < self.max_excerpts:
+                self._open = list(self._before) + [line]
+                self.excerpts.append(self._open)
+                self._after = self.context_lines
+        elif self._open is not None:
+            self._open.append(line)
+            self._after -= 1
+            if self._after <= 0:
+                self._open = None
+        if self._open is not None and len(self._open) >= MAX_EXCERPT_LINES:
+            self._open.append("...")
+            self._open = None
+        self._before.append(line)
+
+    @property
+    def tail(self) -> List[str]:
+        return list(self._tail)
+
+    def _match(self, line: str) -> Optional[str]:
+        for kind, pattern in LOG_PATTERNS:
+            if pattern.search(line):
+                return kind
+        return None
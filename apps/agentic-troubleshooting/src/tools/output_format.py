@@ -0,0 +1,195 @@
+"""Compact, token-budgeted rendering of tool output.
+
+Tables are emitted as TSV with repeated values in leading columns replaced by
+a ditto mark, healthy rows are summarized by the caller, and every tool output
+is cut to a token budget with an explicit "N more ... omitted" marker. Bytes
+and estimated tokens saved are recorded per tool.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from strands.types.tools import AgentTool
+from src.config.settings import Config
+from src.config.telemetry import record_tool_output
+
+DITTO = '"'
+NOTE = f"({DITTO} = same as row above)"
+
+_PADDING = re.compile(r"(?<=\S)[ \t]{2,}(?=\S)")
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"), default=str)
+    return str(value).replace("\t", " ").replace("\n", " ")
+
+
+class Table:
+    """TSV table that elides values repeated from the row above in leading columns."""
+
+    def __init__(self, columns: Sequence[str], elide_columns: int = 1):
+        self.columns = list(columns)
+        self.elide_columns = elide_columns
+        self.rows: List[List[str]] = []
+        self.raw_bytes = len("\t".join(self.columns)) + 1
+
+    def add(self, *values: Any):
+        row = [_cell(value) for value in values]
+        self.raw_bytes += len("\t".join(row)) + 1
+        self.rows.append(row)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def lines(self) -> List[str]:
+        lines = ["\t".join(self.columns)]
+        previous: Optional[List[str]] = None
+        elided = False
+        for row in self.rows:
+            out = list(row)
+            if previous is not None:
+                for i in range(min(self.elide_columns, len(row))):
+                    # Elide a column only while every column before it is elided too
+                    if row[i] != previous[i] or len(row[i]) <= len(DITTO):
+                        break
+                    out[i] = DITTO
+                    elided = True
+            lines.append("\t".join(out))
+            previous = row
+        if elided:
+            lines[0] += f"\t{NOTE}"
+        return lines
+
+
+def fit_budget(lines: List[str], budget_tokens: Optional[int] = None,
+               footer: Iterable[str] = ()) -> str:
+    """Join lines, cutting at the token budget and saying how much was left out.
+
+    Footer lines (e.g. the data freshness note) are always kept.
+    """
+    budget_chars = (budget_tokens or Config.TOOL_OUTPUT_TOKEN_BUDGET) * 4
+    footer = list(footer)
+    remaining = budget_chars - sum(len(line) + 1 for line in footer)
+
+    kept: List[str] = []
+    for index, line in enumerate(lines):
+        if len(line) + 1 > remaining:
+            omitted = len(lines) - index
+            if not kept and remaining > 80:
+                # A single oversized line (e.g. a JSON blob) is cut rather than dropped
+                kept.append(line[:remaining - 60] + " ...")
+                omitted -= 1
+            if omitted:
+                kept.append(f"... {omitted} more lines omitted (output token budget)")
+            else:
+                kept[-1] += " (cut to output token budget)"
+            break
+        kept.append(line)
+        remaining -= len(line) + 1
+
+    return "\n".join(kept + footer) + "\n"
+
+
+def finish(tool_name: str, lines: List[str], footer: Iterable[str] = (),
+           raw_bytes: Optional[int] = None, budget_tokens: Optional[int] = None) -> str:
+    """Apply the budget and record how much smaller the output is than its unencoded form."""
+    text = fit_budget(lines, budget_tokens, footer)
+    if raw_bytes is None:
+        raw_bytes = sum(len(line) + 1 for line in lines) + sum(len(line) + 1 for line in footer)
+    record_tool_output(tool_name, raw_bytes, len(text))
+    return text
+
+
+def compact_text(tool_name: str, text: str, budget_tokens: Optional[int] = None) -> str:
+    """Compact free-form tool output such as MCP results.
+
+    JSON is re-serialized without whitespace, and lists of objects become TSV
+    tables. Plain text has padding between columns collapsed into tabs, while
+    leading indentation is kept so YAML and stack traces keep their nesting.
+    """
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        lines = [_PADDING.sub("\t", line.rstrip()) for line in text.splitlines()]
+    else:
+        lines = _json_lines(data)
+
+    encoded = fit_budget(lines, budget_tokens)
+    record_tool_output(tool_name, len(text), len(encoded))
+    return encoded
+
+
+def _json_lines(data: Any) -> List[str]:
+    if _is_records(data):
+        return _records_table(data).lines()
+    if isinstance(data, dict):
+        lines = []
+        for key, value in data.items():
+            if _is_records(value):
+                lines.append(f"{key}:")
+                lines.extend(_records_table(value).lines())
+            else:
+                lines.append(f"{key}: {_cell(value)}")
+        return lines
+    return [json.dumps(data, separators=(",", ":"), default=str)]
+
+
+def _is_records(value: Any) -> bool:
+    return isinstance(value, list) and len(value) > 1 and all(isinstance(item, dict) for item in value)
+
+
+def _records_table(records: List[Dict[str, Any]]) -> Table:
+    columns: List[str] = []
+    for record in records:
+        columns.extend(key for key in record if key not in columns)
+    table = Table(columns)
+    for record in records:
+        table.add(*(record.get(column) for column in columns))
+    return table
+
+
+class CompactOutputTool(AgentTool):
+    """Wraps a tool (e.g. from MCP) so its text results go through compact_text."""
+
+    def __init__(self, tool: AgentTool, budget_tokens: Optional[int] = None):
+        super().__init__()
+        self._tool = tool
+        self.budget_tokens = budget_tokens
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self):
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool.tool_type
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        async for event in self._tool.stream(tool_use, invocation_state, **kwargs):
+            yield self._compact_event(event)
+
+    def _compact_event(self, event):
+        # Newer strands wrap the final result in a ToolResultEvent, older ones yield the ToolResult
+        if isinstance(event, dict) and "tool_result" in event:
+            event["tool_result"] = self._compact_result(event["tool_result"])
+            return event
+        if isinstance(event, dict) and "toolUseId" in event and "content" in event:
+            return self._compact_result(event)
+        return event
+
+    def _compact_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get("status") == "error":
+            return result
+        content = [
+            {**item, "text": compact_text(self.tool_name, item["text"], self.budget_tokens)}
+            if "text" in item else item
+            for item in result.get("content", [])
+        ]
+        return {**result, "content": content}
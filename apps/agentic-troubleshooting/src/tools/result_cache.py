@@ -0,0 +1,214 @@
+"""Short-lived cache of read-only tool results with single-flight coalescing."""
+
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from strands.types.tools import AgentTool
+from src.config.settings import Config
+from src.config.telemetry import record_cache
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+READ_PREFIXES = ("get_", "list_", "describe_", "search_", "diagnose_", "scan_")
+WRITE_PREFIXES = ("manage_", "apply_", "create_", "delete_", "update_", "patch_", "scale_", "restart_")
+
+
+def is_read_only(tool_name: str) -> bool:
+    return tool_name.startswith(READ_PREFIXES)
+
+
+def is_mutating(tool_name: str) -> bool:
+    return tool_name.startswith(WRITE_PREFIXES)
+
+
+def _tool_result(event) -> Optional[Dict[str, Any]]:
+    """The ToolResult carried by a stream event, if it is the final one."""
+    if isinstance(event, dict) and "tool_result" in event:
+        return event["tool_result"]
+    if isinstance(event, dict) and "toolUseId" in event and "content" in event:
+        return event
+    return None
+
+
+def _cacheable(result: Optional[Dict[str, Any]]) -> bool:
+    if not result or result.get("status") == "error":
+        return False
+    # The local tools report failures as text rather than as error results
+    return not any(item.get("text", "").startswith("Error") for item in result.get("content", []))
+
+
+class ToolResultCache:
+    """Results keyed by tool name and normalized arguments, kept for a short TTL.
+
+    Concurrent identical calls share one execution: the first caller runs the
+    tool and later callers wait on its future, across threads and event loops.
+    Invalidation bumps a generation so results of calls that were in flight
+    when the cluster was changed are not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._results = TTLCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    def key(self, tool_name: str, tool_input: Optional[Dict[str, Any]]) -> Hashable:
+        arguments = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in (tool_input or {}).items()
+            if value is not None
+        }
+        return (tool_name, json.dumps(arguments, sort_keys=True, default=str))
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        result = self._results.get(key)
+        record_cache("tool_result", result is not None)
+        with self._lock:
+            if result is not None:
+                self.hits += 1
+        return result
+
+    def begin(self, key: Hashable) -> Tuple[Future, bool, int]:
+        """Join the in-flight call for key, or start one; returns (future, is_leader, generation)."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False, self._generation
+            future = Future()
+            self._in_flight[key] = future
+            self.misses += 1
+            return future, True, self._generation
+
+    def complete(self, key: Hashable, future: Future, generation: int, result: Optional[Dict[str, Any]]):
+        """Publish the leader's result to waiters and store it if still valid."""
+        with self._lock:
+            self._in_flight.pop(key, None)
+            current = generation == self._generation
+        if current and _cacheable(result):
+            self._results.set(key, result)
+        if result is not None:
+            future.set_result(result)
+        else:
+            future.set_exception(RuntimeError("tool call did not produce a result"))
+
+    def invalidate(self, tool_name: Optional[str] = None):
+        """Drop cached results (all, or one tool's) and notify invalidation listeners."""
+        with self._lock:
+            self._generation += 1
+        if tool_name is None:
+            self._results.clear()
+        else:
+            for key, _ in self._results.items():
+                if key[0] == tool_name:
+                    self._results.pop(key)
+        for listener in self._listeners:
+            listener(tool_name)
+
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], None]):
+        """Call listener(tool_name) whenever results are invalidated (None means all)."""
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.coalesced + self.misses
+            return {
+                "size": len(self._results),
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.coalesced) / total if total else 0.0
+            }
+
+
+class CachedTool(AgentTool):
+    """Serves a read-only tool from the cache, or invalidates the cache after a mutating tool."""
+
+    def __init__(self, tool: AgentTool, cache: ToolResultCache, mutating: bool = False):
+        super().__init__()
+        self._tool = tool
+        self.cache = cache
+        self.mutating = mutating
+
+    @property
+    def tool_name(self) -> str:
+        return self._tool.tool_name
+
+    @property
+    def tool_spec(self):
+        return self._tool.tool_spec
+
+    @property
+    def tool_type(self) -> str:
+        return self._tool.tool_type
+
+    async def stream(self, tool_use, invocation_state, **kwargs):
+        if self.mutating:
+            async for event in self._tool.stream(tool_use, invocation_state, **kwargs):
+                yield event
+            logger.info(f"Invalidating tool result cache after {self.tool_name}")
+            self.cache.invalidate()
+            return
+
+        key = self.cache.key(self.tool_name, tool_use.get("input"))
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield {**cached, "toolUseId": tool_use["toolUseId"]}
+            return
+
+        future, leader, generation = self.cache.begin(key)
+        if not leader:
+            try:
+                result = await asyncio.wrap_future(future)
+                yield {**result, "toolUseId": tool_use["toolUseId"]}
+                return
+            except Exception:
+                pass  # The shared call failed, so make our own
+
+        result = None
+        try:
+            async for event in self._tool.stream(tool_use, invocation_state, **kwargs):
+                result = _tool_result(event) or result
+                yield event
+        finally:
+            if leader:
+                self.cache.complete(key, future, generation, result)
+
+
+def wrap_tools(tools: list, cache: ToolResultCache) -> list:
+    """Cache read-only tools and make mutating tools invalidate the cache."""
+    wrapped = []
+    for tool in tools:
+        if is_read_only(tool.tool_name):
+            wrapped.append(CachedTool(tool, cache))
+        elif is_mutating(tool.tool_name):
+            wrapped.append(CachedTool(tool, cache, mutating=True))
+        else:
+            wrapped.append(tool)
+    return wrapped
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache() -> Optional[ToolResultCache]:
+    """The process-wide tool result cache, shared by all threads, or None if disabled."""
+    global _cache
+    if not Config.ENABLE_TOOL_RESULT_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ToolResultCache(
+                ttl_seconds=Config.TOOL_RESULT_CACHE_TTL_SECONDS,
+                max_entries=Config.TOOL_RESULT_CACHE_SIZE
+            )
+        return _cache
@@ -0,0 +1,80 @@
+"""Local evaluation of Kubernetes label and field selectors against cached pod records."""
+
+import re
+from typing import Callable, Dict, Optional
+
+Matcher = Callable[[Dict], bool]
+
+# Split on commas that are not inside a set, e.g. "app in (a,b),tier=web"
+_REQUIREMENT_SPLIT = re.compile(r",(?![^()]*\))")
+_SET_REQUIREMENT = re.compile(r"^([\w./-]+)\s+(in|notin)\s+\(([^)]*)\)$")
+_EQUALITY_REQUIREMENT = re.compile(r"^([\w./-]+)\s*(==|=|!=)\s*([\w./-]*)$")
+_EXISTS_REQUIREMENT = re.compile(r"^(!?)([\w./-]+)$")
+
+# Pod fields the cache can answer, as supported by the API server's field selectors
+_POD_FIELDS = {
+    "metadata.name": lambda pod: pod["name"],
+    "metadata.namespace": lambda pod: pod["namespace"],
+    "spec.nodeName": lambda pod: pod["node"] or "",
+    "status.phase": lambda pod: pod["phase"] or "",
+    "status.podIP": lambda pod: pod["ip"] or "",
+}
+
+
+def label_matcher(selector: Optional[str]) -> Optional[Matcher]:
+    """Compile a label selector into a predicate over pod records; None if it cannot be parsed."""
+    requirements = []
+    for part in _REQUIREMENT_SPLIT.split(selector or ""):
+        part = part.strip()
+        if not part:
+            continue
+
+        match = _SET_REQUIREMENT.match(part)
+        if match:
+            key, operator, values = match.groups()
+            values = {value.strip() for value in values.split(",")}
+            if operator == "in":
+                requirements.append(lambda labels, k=key, v=values: labels.get(k) in v)
+            else:
+                requirements.append(lambda labels, k=key, v=values: labels.get(k) not in v)
+            continue
+
+        match = _EQUALITY_REQUIREMENT.match(part)
+        if match:
+            key, operator, value = match.groups()
+            if operator == "!=":
+                requirements.append(lambda labels, k=key, v=value: labels.get(k) != v)
+            else:
+                requirements.append(lambda labels, k=key, v=value: labels.get(k) == v)
+            continue
+
+        match = _EXISTS_REQUIREMENT.match(part)
+        if match:
+            negate, key = match.groups()
+            requirements.append(lambda labels, k=key, n=bool(negate): (k in labels) != n)
+            continue
+
+        return None
+
+    return lambda pod: all(requirement(pod["labels"]) for requirement in requirements)
+
+
+def field_matcher(selector: Optional[str]) -> Optional[Matcher]:
+    """Compile a pod field selector into a predicate; None if it uses fields the cache lacks."""
+    requirements = []
+    for part in (selector or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+
+        match = _EQUALITY_REQUIREMENT.match(part)
+        if not match or match.group(1) not in _POD_FIELDS:
+            return None
+        field, operator, value = match.groups()
+        getter = _POD_FIELDS[field]
+        if operator == "!=":
+            requirements.append(lambda pod, g=getter, v=value: g(pod) != v)
+        else:
+            requirements.append(lambda pod, g=getter, v=value: g(pod) == v)
+
+    return lambda pod: all(requirement(pod) for requirement in requirements)
@@ -0,0 +1,116 @@
+"""Per-key message debouncing for Slack events."""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class MessageDebouncer:
+    """Coalesces bursts of events per key into a single flush.
+    
+    Every new event for a key restarts that key's timer, so flush(key, events)
+    runs once the key has been quiet for delay_seconds. Timers run on their own
+    threads and never block the caller.
+    """
+    
+    def __init__(self, delay_seconds: float, flush: Callable[[str, List[Any]], None]):
+        self.delay_seconds = delay_seconds
+        self.flush = flush
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[Any]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+    
+    def add(self, key: str, event: Any):
+        """Buffer an event and (re)start the quiet-period timer for its key."""
+        if self.delay_seconds <= 0:
+            self._flush(key, [event])
+            return
+        
+        with self._lock:
+            self._pending.setdefault(key, []).append(event)
+            timer = self._timers.get(key)
+            if timer:
+                timer.cancel()
+            timer = threading.Timer(self.delay_seconds, self._fire, args=(key,))
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+    
+    def _fire(self, key: str):
+        with self._lock:
+            self._timers.pop(key, None)
+            events = self._pending.pop(key, [])
+        if events:
+            if len(events) > 1:
+                logger.info(f"Coalesced {len(events)} messages for {key}")
+            self._flush(key, events)
+    
+    def _flush(self, key: str, events: List[Any]):
+        try:
+            self.flush(key, events)
+        except Exception as e:
+            logger.error(f"Error flushing debounced messages for {key}: {e}")
+    
+    def cancel_all(self):
+        """Drop all buffered events and stop their timers."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+            self._pending.clear()
+
+
+class AsyncMessageDebouncer:
+    """MessageDebouncer for asyncio, scheduling flushes on the running event loop.
+    
+    flush(key, events) is a coroutine function and runs as its own task.
+    """
+    
+    def __init__(self, delay_seconds: float, flush: Callable[[str, List[Any]], Awaitable[None]]):
+        self.delay_seconds = delay_seconds
+        self.flush = flush
+        self._pending: Dict[str, List[Any]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks = set()
+    
+    def add(self, key: str, event: Any):
+        """Buffer an event and (re)start the quiet-period timer for its key."""
+        if self.delay_seconds <= 0:
+            self._start_flush(key, [event])
+            return
+        
+        self._pending.setdefault(key, []).append(event)
+        timer = self._timers.get(key)
+        if timer:
+            timer.cancel()
+        self._timers[key] = asyncio.get_running_loop().call_later(self.delay_seconds, self._fire, key)
+    
+    def _fire(self, key: str):
+        self._timers.pop(key, None)
+        events = self._pending.pop(key, [])
+        if events:
+            if len(events) > 1:
+                logger.info(f"Coalesced {len(events)} messages for {key}")
+            self._start_flush(key, events)
+    
+    def _start_flush(self, key: str, events: List[Any]):
+        # Keep a reference so the task isn't garbage collected mid-flight
+        task = asyncio.get_running_loop().create_task(self._flush(key, events))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _flush(self, key: str, events: List[Any]):
+        try:
+            await self.flush(key, events)
+        except Exception as e:
+            logger.error(f"Error flushing debounced messages for {key}: {e}")
+    
+    def cancel_all(self):
+        """Drop all buffered events and stop their timers."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        self._pending.clear()
@@ -0,0 +1,53 @@
+"""Text normalization helpers."""
+
+import re
+
+# Order matters: the more specific patterns must run before the generic number mask
+_MASKS = [
+    (re.compile(r"<[@#!][^>]*>"), "<ref>"),
+    (re.compile(r"https?://\S+"), "<url>"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"), "<uuid>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    # Deployment pod suffixes, e.g. checkout-7d9f8b6c5-x2x9k -> checkout-<pod>
+    (re.compile(r"-[a-z0-9]{6,10}-[a-z0-9]{5}\b"), "-<pod>"),
+    (re.compile(r"\b(?=[0-9a-f]*\d)[0-9a-f]{7,}\b"), "<hash>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+]
+_WHITESPACE = re.compile(r"\s+")
+
+# Names of cluster objects: anything with a digit or joined by - . / : (pod and
+# node names, IPs, versions), plus the word after or before a resource noun
+_IDENTIFIER = re.compile(r"(?<![\w.-])(?:[a-z0-9_]+(?:[-./:][a-z0-9_]+)+|[a-z_-]*\d[\w.-]*)")
+_NAMED = re.compile(
+    r"\b(?:namespace|ns|-n|node|pod|deployment|service|svc|app|job|statefulset|daemonset)\s+([a-z0-9][\w.-]*)"
+)
+_NAMED_BEFORE = re.compile(r"\b([a-z0-9][\w-]*)\s+(?:namespace|ns|node|pod|deployment|service)\b")
+_NOT_NAMES = {"the", "a", "an", "my", "our", "this", "that", "is", "are", "in", "of", "keeps", "has", "was",
+              "not", "each", "every", "any", "some", "all", "which", "what"}
+
+
+def fold_message(message: str) -> str:
+    """Fold case and whitespace only, keeping names, IPs and numbers intact."""
+    return _WHITESPACE.sub(" ", (message or "").lower()).strip(" .!?")
+
+
+def normalize_message(message: str) -> str:
+    """Fold case and whitespace and mask volatile tokens.
+    
+    Messages that differ only by user mentions, pod hashes, IDs, IPs or
+    numbers normalize to the same string, which makes them usable as cache keys.
+    """
+    text = (message or "").lower()
+    for pattern, replacement in _MASKS:
+        text = pattern.sub(replacement, text)
+    return _WHITESPACE.sub(" ", text).strip(" .!?")
+
+
+def resource_identifiers(message: str) -> frozenset:
+    """Pod, node, namespace and service names, IPs and versions mentioned in a message."""
+    text = fold_message(message)
+    found = set(_IDENTIFIER.findall(text))
+    found.update(_NAMED.findall(text))
+    found.update(_NAMED_BEFORE.findall(text))
+    return frozenset(token.strip(".:/-") for token in found if token.strip(".:/-") not in _NOT_NAMES)
+
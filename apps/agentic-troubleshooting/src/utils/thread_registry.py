@@ -0,0 +1,93 @@
+"""Registry of Slack threads the bot is participating in."""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ActiveThreadRegistry:
+    """Bounded, expiring set of channel:thread_ts keys.
+    
+    Threads are forgotten after ttl_seconds without bot activity, and the least
+    recently active threads are dropped once max_threads is reached. When a
+    snapshot_path is configured the registry is periodically written to disk and
+    restored on startup, so a restarted pod keeps following recent threads.
+    """
+    
+    def __init__(self, max_threads: int, ttl_seconds: float,
+                 snapshot_path: Optional[str] = None, snapshot_interval: float = 60):
+        self.threads = TTLCache(max_size=max_threads, ttl_seconds=ttl_seconds)
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_lock = threading.Lock()
+        self._last_snapshot = time.monotonic()
+        
+        if self.snapshot_path:
+            self.restore()
+    
+    def add(self, thread_key: str):
+        """Mark a thread as active, restarting its TTL."""
+        self.threads.set(thread_key, True)
+        
+        if self.snapshot_path and time.monotonic() - self._last_snapshot >= self.snapshot_interval:
+            self.snapshot()
+    
+    def discard(self, thread_key: str):
+        """Stop tracking a thread."""
+        self.threads.pop(thread_key)
+    
+    def __contains__(self, thread_key: str) -> bool:
+        return thread_key in self.threads
+    
+    def __len__(self) -> int:
+        return len(self.threads)
+    
+    def snapshot(self):
+        """Write live threads and their wall-clock expiry to snapshot_path."""
+        if not self.snapshot_path:
+            return
+        
+        with self._snapshot_lock:
+            self._last_snapshot = time.monotonic()
+            now = time.time()
+            data = {key: now + remaining for key, remaining in self.threads.expiries().items()}
+            
+            try:
+                directory = os.path.dirname(self.snapshot_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                
+                # Write to a temp file first so a crash never leaves a partial snapshot
+                tmp_path = f"{self.snapshot_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.snapshot_path)
+                logger.debug(f"Saved {len(data)} active threads to {self.snapshot_path}")
+            except Exception as e:
+                logger.error(f"Failed to snapshot active threads: {e}")
+    
+    def restore(self):
+        """Load unexpired threads from snapshot_path."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to restore active threads: {e}")
+            return
+        
+        now = time.time()
+        # Oldest first so the most recent threads survive any size limit
+        live = sorted((expires_at, key) for key, expires_at in data.items() if expires_at > now)
+        for expires_at, key in live:
+            self.threads.set(key, True, ttl_seconds=expires_at - now)
+        
+        logger.info(f"Restored {len(live)} active threads from {self.snapshot_path}")
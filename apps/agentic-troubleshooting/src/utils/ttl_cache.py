@@ -0,0 +1,188 @@
+"""Thread-safe LRU cache with per-entry expiry."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """LRU cache whose entries also expire a fixed time after they were set.
+    
+    Expired entries are dropped lazily on access and whenever the cache is
+    written to. The optional on_evict callback receives (key, value) for every
+    entry that leaves the cache through expiry, size pressure or pop().
+    """
+    
+    def __init__(self, max_size: int, ttl_seconds: float,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._lock = threading.RLock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live value and mark it as recently used."""
+        evicted = []
+        with self._lock:
+            value = self._get_locked(key, evicted)
+            if value is _MISSING:
+                self.misses += 1
+                value = default
+            else:
+                self.hits += 1
+        self._notify(evicted)
+        return value
+    
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Insert or replace a value, evicting the least recently used entries if full.
+        
+        ttl_seconds overrides the cache TTL for this entry only.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        evicted = []
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            self._shrink_locked(evicted)
+        self._notify(evicted)
+    
+    def add(self, key: Hashable, value: Any = True) -> bool:
+        """Insert a value only if the key is not already live. Returns True if inserted."""
+        evicted = []
+        with self._lock:
+            if self._get_locked(key, evicted) is not _MISSING:
+                inserted = False
+            else:
+                self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._shrink_locked(evicted)
+                inserted = True
+        self._notify(evicted)
+        return inserted
+    
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the live value for a key, creating it with factory() if absent."""
+        evicted = []
+        with self._lock:
+            value = self._get_locked(key, evicted)
+            if value is _MISSING:
+                self.misses += 1
+                value = factory()
+                self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._shrink_locked(evicted)
+            else:
+                self.hits += 1
+        self._notify(evicted)
+        return value
+    
+    def touch(self, key: Hashable) -> bool:
+        """Restart the TTL of a live entry. Returns False if the key is not cached."""
+        evicted = []
+        with self._lock:
+            value = self._get_locked(key, evicted)
+            if value is not _MISSING:
+                self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._notify(evicted)
+        return value is not _MISSING
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove a key and return its value."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self._notify([(key, entry[1])], count=False)
+        return entry[1]
+    
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            evicted = [(key, value) for key, (_, value) in self._data.items()]
+            self._data.clear()
+        self._notify(evicted, count=False)
+    
+    def purge_expired(self) -> int:
+        """Drop all expired entries and return how many were removed."""
+        evicted = []
+        with self._lock:
+            self._purge_locked(evicted)
+        self._notify(evicted)
+        return len(evicted)
+    
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of live (key, value) pairs, least recently used first."""
+        self.purge_expired()
+        with self._lock:
+            return [(key, value) for key, (_, value) in self._data.items()]
+    
+    def expiries(self) -> Dict[Hashable, float]:
+        """Remaining lifetime in seconds of every live key."""
+        self.purge_expired()
+        now = time.monotonic()
+        with self._lock:
+            return {key: expires_at - now for key, (expires_at, _) in self._data.items()}
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        evicted = []
+        with self._lock:
+            found = self._get_locked(key, evicted) is not _MISSING
+        self._notify(evicted)
+        return found
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+    
+    def _get_locked(self, key: Hashable, evicted: list) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            evicted.append((key, value))
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+    
+    def _purge_locked(self, evicted: list):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at <= now]:
+            evicted.append((key, self._data.pop(key)[1]))
+    
+    def _shrink_locked(self, evicted: list):
+        if len(self._data) <= self.max_size:
+            return
+        self._purge_locked(evicted)
+        while len(self._data) > self.max_size:
+            key, (_, value) = self._data.popitem(last=False)
+            evicted.append((key, value))
+    
+    def _notify(self, evicted: list, count: bool = True):
+        """Run the eviction callback outside the lock."""
+        if not evicted:
+            return
+        if count:
+            with self._lock:
+                self.evictions += len(evicted)
+        if self.on_evict:
+            for key, value in evicted:
+                self.on_evict(key, value)
@@ -0,0 +1,72 @@
+"""Bounded worker pool that serializes work per key."""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Deque, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class KeyedWorkerPool:
+    """Runs tasks for different keys in parallel while keeping each key in order.
+    
+    Slack threads are used as keys, so two messages in the same thread are
+    answered one after the other while unrelated threads run concurrently.
+    """
+    
+    def __init__(self, max_workers: int, max_pending: int, name: str = "worker"):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._queues: Dict[str, Deque[Callable]] = {}
+        self._pending = 0
+    
+    def submit(self, key: str, fn: Callable, *args, **kwargs) -> bool:
+        """Queue a task for a key. Returns False if the pool is saturated."""
+        task = partial(fn, *args, **kwargs)
+        with self._lock:
+            if self._pending >= self.max_pending:
+                logger.warning(f"Worker pool full ({self._pending} pending), rejecting task for {key}")
+                return False
+            self._pending += 1
+            
+            # Another task for this key is running, run after it
+            if key in self._queues:
+                self._queues[key].append(task)
+                logger.debug(f"Queued task behind running task for {key}")
+                return True
+            self._queues[key] = deque()
+        
+        self.executor.submit(self._run, key, task)
+        return True
+    
+    def _run(self, key: str, task: Callable):
+        """Run a task and hand the key over to its next queued task."""
+        try:
+            task()
+        except Exception as e:
+            logger.error(f"Worker task failed for {key}: {e}")
+        finally:
+            with self._lock:
+                self._pending -= 1
+                queue = self._queues[key]
+                next_task = queue.popleft() if queue else None
+                if next_task is None:
+                    del self._queues[key]
+            
+            # Resubmit rather than loop so a busy key can't starve other keys
+            if next_task is not None:
+                self.executor.submit(self._run, key, next_task)
+    
+    @property
+    def pending(self) -> int:
+        """Number of queued or running tasks."""
+        with self._lock:
+            return self._pending
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running tasks."""
+        self.executor.shutdown(wait=wait)
@@ -254,7 +254,7 @@ resource "helm_release" "agentic_agent" {
         rules = [
           {
             apiGroups = [""]
-            resources = ["pods", "services", "events"]
+            resources = ["pods", "services", "events", "nodes"]
             verbs     = ["get", "list", "watch"]
           },
           {